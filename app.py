@@ -1,7 +1,20 @@
 import pygame
 import asyncio
+import os
 import platform
+import random
+import time
+import assets
+import constants
 from game_manager import GameManager
+from game_clock import FrameClock
+from input_source import KeyboardInput
+from replay import Recorder, RecordingInput
+from hud import draw_loading_screen
+from rendering import DirtyRectRenderer
+from game_loop import LoopScheduler
+from profiler import profiler
+from audio import audio
 from constants import WIDTH, HEIGHT
 
 # Initialize Pygame and set up the main window
@@ -11,32 +24,95 @@ pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Beaver Shooter Game")
 
-# Instantiate the main game manager (handles all game logic and state)
-game = GameManager()
+# Time is sampled once per update and all randomness comes from one seeded RNG,
+# so a session can be reproduced exactly from its recorded input (see replay.py)
+clock = FrameClock()
+seed = random.randrange(2 ** 32)
+input_source = KeyboardInput()
+recorder = None
+if constants.REPLAY_RECORDING:
+    os.makedirs(constants.REPLAY_DIR, exist_ok=True)
+    recorder = Recorder(os.path.join(constants.REPLAY_DIR, time.strftime("%Y%m%d-%H%M%S.bvr")), seed)
+    input_source = RecordingInput(input_source, recorder)
+
+# The main game manager (handles all game logic and state), created once the assets are loaded
+game = None
+
+# Redraw only what changed on weak hardware and in the web build (full-screen flips are slow there)
+renderer = None
+if constants.DIRTY_RECT_RENDERING or platform.system() == "Emscripten":
+    renderer = DirtyRectRenderer()
 
 def setup():
     # Placeholder for any future setup logic (currently unused)
     pass
 
-def update_loop():
+def update_step():
+    clock.tick() # One time value for the whole update
     # Handle user input/events; if user quits, stop the loop
     running = game.handle_events()
     if not running:
+        if recorder is not None:
+            recorder.close()
         return False
     # Update game state (movement, collisions, etc.)
     game.update()
-    # Draw everything to the screen
-    game.draw(screen)
-    # Refresh the display
-    pygame.display.flip()
+    if recorder is not None:
+        recorder.end_frame()
+    return True
+
+def render_frame(alpha=1.0):
+    # alpha: how far into the next update we are, used to interpolate moving things
+    if renderer is not None:
+        # Draw and push only the changed areas
+        rects = renderer.render(screen, game, alpha)
+        overlay_rect = profiler.draw_overlay(screen)
+        if overlay_rect is not None:
+            rects.append(overlay_rect)
+            renderer.previous.append(overlay_rect) # Erase it next frame like a sprite
+        with profiler.phase("flip"):
+            pygame.display.update(rects)
+    else:
+        # Draw everything to the screen
+        game.draw(screen, alpha)
+        # Profiler stats on top (F3)
+        profiler.draw_overlay(screen)
+        # Refresh the display
+        with profiler.phase("flip"):
+            pygame.display.flip()
+
+def update_loop():
+    # One update and one frame (for callers that drive the loop themselves)
+    if not update_step():
+        return False
+    render_frame()
+    return True
+
+# Updates run at a fixed rate, frames are drawn at most MAX_FPS times per second
+scheduler = LoopScheduler(update_step, render_frame, constants.UPDATE_RATE, constants.MAX_FPS)
+
+async def load_assets():
+    # Decode, convert and scale every image/sound before the game starts (so nothing is loaded
+    # mid-fight), while a loading screen keeps the window alive. Returns False if the user quits.
+    preloader = assets.Preloader(threaded=platform.system() != "Emscripten").start()
+    font = assets.load_font("arial", 24)
+    while not preloader.done:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        draw_loading_screen(screen, font, preloader.poll())
+        pygame.display.flip()
+        await asyncio.sleep(1 / 60) # Let the loader thread (or the browser) run
     return True
 
 async def main():
+    global game
     setup()  # Run any setup code
-    while True:
-        if not update_loop():
-            break  # Exit loop if user quits
-        await asyncio.sleep(1.0 / 60) # Run at ~60 FPS
+    if not await load_assets():
+        return
+    audio.setup() # Reserve mixer channels for the game's sounds
+    game = GameManager(clock=clock, input_source=input_source, rng=random.Random(seed))
+    await scheduler.run() # Returns when the user quits
 
 # Entry point: run the game loop depending on platform
 if platform.system() == "Emscripten":
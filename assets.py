@@ -0,0 +1,210 @@
+import pygame
+import queue
+import threading
+import constants # Import constants module to access shared variables
+from rotation_cache import RotationCache
+
+# Shared asset cache: every image/sound is decoded, converted and scaled only once.
+# Images are keyed by (path, size, alpha), sounds by path, fonts by (name, size, bold).
+_images = {}
+_sounds = {}
+_rotations = {}
+_fonts = {}
+
+# Headless mode: no display or mixer, images become blank surfaces and sounds do nothing
+headless = False
+
+# Cache statistics (hits = served from cache, misses = loaded from disk)
+hits = 0
+misses = 0
+
+# Every asset the game needs, so preload() can pay the cost at startup.
+# Each image entry is (path, size, alpha); size None keeps the original size.
+IMAGE_MANIFEST = [
+    ("images/bobar_1.png", (80, 80), True),            # Beaver
+    ("images/pushka.png", (80, 40), True),             # Gun
+    ("images/vidra.png", (100, 80), True),             # Enemy (otter)
+    ("images/endImg.jpeg", (constants.WIDTH, constants.HEIGHT), False), # Game over background
+]
+SOUND_MANIFEST = [
+    "audio/shot.mp3",               # Shooting sound
+    "audio/screaming_beaver.mp3",   # Game over sound
+]
+# Gun sprite rotations: (path, size, tip length)
+GUN_ROTATIONS = ("images/pushka.png", (80, 40), 80)
+
+class NullSound:
+    # Stand-in for pygame.mixer.Sound when there is no mixer
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def get_length(self):
+        return 0.0
+
+def set_headless(enabled=True):
+    # Switch to placeholder assets (drops anything already cached)
+    global headless
+    headless = enabled
+    clear()
+
+def load_image(path, size=None, alpha=True):
+    global hits, misses
+    key = (path, size, alpha)
+    image = _images.get(key)
+    if image is not None:
+        hits += 1
+        return image
+    misses += 1
+    if headless:
+        # Right size, no pixels: nothing is ever shown, and convert() needs a display
+        image = pygame.Surface(size or (1, 1), pygame.SRCALPHA if alpha else 0)
+        _images[key] = image
+        return image
+    image = _prepare_image(pygame.image.load(path), size, alpha)
+    _images[key] = image
+    return image
+
+def _prepare_image(image, size, alpha):
+    # convert()/convert_alpha() need the display to be set up first (main thread only)
+    image = image.convert_alpha() if alpha else image.convert()
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    return image
+
+def load_sound(path):
+    global hits, misses
+    sound = _sounds.get(path)
+    if sound is not None:
+        hits += 1
+        return sound
+    misses += 1
+    sound = NullSound() if headless else pygame.mixer.Sound(path)
+    _sounds[path] = sound
+    return sound
+
+def load_rotations(path, size, tip_length):
+    # Pre-rotated copies of an image (see rotation_cache.py), built once per (path, size)
+    global hits, misses
+    key = (path, size, tip_length)
+    rotations = _rotations.get(key)
+    if rotations is not None:
+        hits += 1
+        return rotations
+    misses += 1
+    rotations = RotationCache(load_image(path, size), tip_length)
+    _rotations[key] = rotations
+    return rotations
+
+def load_font(name, size, bold=False):
+    # System fonts are slow to look up, so each one is created once
+    global hits, misses
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is not None:
+        hits += 1
+        return font
+    misses += 1
+    font = pygame.font.SysFont(name, size, bold=bold)
+    _fonts[key] = font
+    return font
+
+def preload():
+    # Load everything in the manifests (call once after pygame.display.set_mode)
+    for path, size, alpha in IMAGE_MANIFEST:
+        load_image(path, size, alpha)
+    for path in SOUND_MANIFEST:
+        load_sound(path)
+    # Gun rotations (every 5 degrees between -90 and 90)
+    load_rotations(*GUN_ROTATIONS)
+
+class Preloader:
+    # Background version of preload() for the loading screen.
+    # Files are read and decoded on a worker thread; poll(), called from the main loop
+    # between loading screen frames, converts whatever is ready (that needs the display)
+    # and puts it in the cache. Without threads (web build) poll() decodes one file per call.
+    def __init__(self, threaded=True):
+        self.threaded = threaded
+        self.total = len(IMAGE_MANIFEST) + len(SOUND_MANIFEST) + 1 # +1 for the gun rotations
+        self.loaded = 0
+        self._ready = queue.Queue() # (kind, key, decoded asset) from the worker
+        self._steps = self._decode_steps()
+        self._thread = None
+
+    def start(self):
+        if headless:
+            # Placeholders are instant, nothing to do in the background
+            preload()
+            self.loaded = self.total
+            return self
+        if self.threaded:
+            self._thread = threading.Thread(target=self._decode, name="asset-loader", daemon=True)
+            self._thread.start()
+        return self
+
+    def _decode_steps(self):
+        # Reads and decodes one file per step: (kind, key, decoded asset)
+        for path, size, alpha in IMAGE_MANIFEST:
+            yield "image", (path, size, alpha), pygame.image.load(path)
+        for path in SOUND_MANIFEST:
+            yield "sound", path, pygame.mixer.Sound(path)
+
+    def _decode(self):
+        try:
+            for step in self._steps:
+                self._ready.put(step)
+        except Exception as error: # Re-raised on the main thread by poll()
+            self._ready.put(("error", None, error))
+
+    @property
+    def done(self):
+        return self.loaded == self.total
+
+    def poll(self):
+        # Finish everything decoded so far, returns the progress (0 to 1)
+        global misses
+        if not self.threaded:
+            step = next(self._steps, None)
+            if step is not None:
+                self._ready.put(step)
+        while True:
+            try:
+                kind, key, asset = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "error":
+                raise asset
+            if kind == "image":
+                _images[key] = _prepare_image(asset, key[1], key[2])
+            else:
+                _sounds[key] = asset
+            misses += 1
+            self.loaded += 1
+        if self.loaded == self.total - 1:
+            # Every image is in, rotate the gun sprite last
+            load_rotations(*GUN_ROTATIONS)
+            self.loaded += 1
+        return self.loaded / self.total
+
+def stats():
+    # Snapshot of the cache state, handy for debugging and profiling
+    return {
+        "hits": hits,
+        "misses": misses,
+        "images": len(_images),
+        "sounds": len(_sounds),
+        "rotations": len(_rotations),
+        "fonts": len(_fonts),
+    }
+
+def clear():
+    # Drop every cached asset and reset the counters
+    global hits, misses
+    _images.clear()
+    _sounds.clear()
+    _rotations.clear()
+    _fonts.clear()
+    hits = 0
+    misses = 0
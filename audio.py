@@ -0,0 +1,105 @@
+import pygame
+import assets # Shared sound cache
+
+# Sound playback with reserved channel groups, per-sound voice limits and cooldowns.
+# Each group owns a fixed set of mixer channels (reserved, so pygame never hands them to
+# anything else), and a sound only ever plays on its group's channels. A sound at its voice
+# limit restarts its oldest voice instead of taking another channel; a full group reuses
+# its oldest channel. Sounds are fully decoded to PCM when loaded (assets.load_sound), so
+# playing one never decodes MP3.
+#
+# Without a mixer (headless runs, no audio device) every call is a no-op.
+
+# Reserved channels per group
+CHANNEL_GROUPS = {
+    "weapons": 4, # Shots
+    "voice": 1,   # Beaver screams
+}
+FREE_CHANNELS = 4 # Unreserved channels left for anything else
+
+# name -> (path, group, max voices, cooldown in ms, volume)
+SOUNDS = {
+    "shot": ("audio/shot.mp3", "weapons", 3, 40, 1.0),
+    "scream": ("audio/screaming_beaver.mp3", "voice", 1, 0, 1.0),
+}
+
+class Audio:
+    def __init__(self, groups=CHANNEL_GROUPS, sounds=SOUNDS, timer=pygame.time.get_ticks):
+        self.groups = groups
+        self.specs = sounds
+        self.timer = timer # Time source for cooldowns (ms)
+        self.ready = False # setup() done
+        self.enabled = False # False: null backend, nothing is played
+        self.channels = {} # group -> channel indices
+        self._channels = [] # index -> pygame.mixer.Channel
+        self.sounds = {} # name -> pygame.mixer.Sound
+        self.voices = {} # channel index -> (sound name, start time)
+        self.last_played = {} # sound name -> start time
+        # Statistics
+        self.played = 0
+        self.throttled = 0 # Dropped by a cooldown
+        self.restarted = 0 # Played over an older voice (voice limit or full group)
+
+    def setup(self):
+        # Reserve the channels and load the sounds (done on the first play() if not called)
+        self.ready = True
+        if assets.headless or not pygame.mixer.get_init():
+            self.enabled = False
+            return
+        reserved = sum(self.groups.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + FREE_CHANNELS))
+        pygame.mixer.set_reserved(reserved) # Channels below this are never picked automatically
+        self._channels = [pygame.mixer.Channel(index) for index in range(reserved)]
+        first = 0
+        for group, count in self.groups.items():
+            self.channels[group] = list(range(first, first + count))
+            first += count
+        for name, (path, _, _, _, volume) in self.specs.items():
+            sound = assets.load_sound(path)
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+        self.enabled = True
+
+    def play(self, name):
+        # Returns the channel used, or None if nothing was played
+        if not self.ready:
+            self.setup()
+        if not self.enabled:
+            return None
+        _, group, max_voices, cooldown_ms, _ = self.specs[name]
+        now = self.timer()
+        last = self.last_played.get(name)
+        if last is not None and now - last < cooldown_ms:
+            self.throttled += 1
+            return None
+        busy = [index for index in self.channels[group] if self._channels[index].get_busy()]
+        same = [index for index in busy if self.voices[index][0] == name]
+        if len(same) >= max_voices:
+            index = min(same, key=lambda index: self.voices[index][1])
+        else:
+            free = [index for index in self.channels[group] if index not in busy]
+            index = free[0] if free else min(busy, key=lambda index: self.voices[index][1])
+        channel = self._channels[index]
+        if index in busy:
+            self.restarted += 1
+        channel.play(self.sounds[name])
+        self.voices[index] = (name, now)
+        self.last_played[name] = now
+        self.played += 1
+        return channel
+
+    def stop(self):
+        for channel in self._channels:
+            channel.stop()
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "played": self.played,
+            "throttled": self.throttled,
+            "restarted": self.restarted,
+            "busy": sum(channel.get_busy() for channel in self._channels),
+        }
+
+# Shared instance used by the game
+audio = Audio()
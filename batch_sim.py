@@ -0,0 +1,154 @@
+import argparse
+import gzip
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import constants # Import constants module to access and modify shared variables
+from profiler import percentile
+
+# Batch simulator for difficulty tuning.
+# Plays many headless games (see simulation.py) for every combination of the swept
+# constants, spread over a process pool, and writes aggregated results to a compact
+# JSON file (gzip-compressed when the name ends in .gz). Game i of every combination
+# uses seed base_seed + i, so combinations are compared on the same enemy waves and any
+# single game can be replayed with HeadlessSimulation(seed, policy).
+#
+#   python batch_sim.py --games 200 --policy aim --param MAX_AMMO=10,15,20 \
+#       --param RELOAD_TIME_SECONDS=1,2,3 --out tuning.json.gz
+
+# Constants that may be swept
+TUNABLE = ["MAX_AMMO", "RELOAD_TIME_SECONDS", "BULLET_DELAY", "SPAWN_INTERVAL",
+           "STAGE_ONE_SPEED", "STAGE_TWO_SPEED"]
+
+_defaults = {} # Constant values before any overrides (per worker process)
+
+def _parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def parse_param(spec):
+    # "MAX_AMMO=10,15,20" -> ("MAX_AMMO", [10, 15, 20])
+    name, _, values = spec.partition("=")
+    name = name.strip().upper()
+    if name not in TUNABLE:
+        raise argparse.ArgumentTypeError(f"{name} is not tunable (choose from {', '.join(TUNABLE)})")
+    if not values:
+        raise argparse.ArgumentTypeError(f"No values given for {name}")
+    return name, [_parse_value(value) for value in values.split(",")]
+
+def _init_worker():
+    # Runs once per worker process: remember the default constants
+    for name in TUNABLE:
+        _defaults[name] = getattr(constants, name)
+
+def _apply(params):
+    for name in TUNABLE:
+        setattr(constants, name, params.get(name, _defaults[name]))
+
+def _play(task):
+    # One game: (combination index, params, seed, policy name, max frames, backend)
+    index, params, seed, policy_name, max_frames, backend = task
+    from simulation import HeadlessSimulation, POLICIES
+    _apply(params)
+    result = HeadlessSimulation(seed, POLICIES[policy_name], backend).run(max_frames)
+    return index, result
+
+def _distribution(values):
+    values = sorted(values)
+    return {
+        "mean": sum(values) / len(values),
+        "p10": percentile(values, 10),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "max": values[-1],
+    }
+
+def aggregate(params, results):
+    # Summary of all games of one combination, plus the raw per-game columns
+    results = sorted(results, key=lambda result: result["seed"])
+    return {
+        "params": params,
+        "games": len(results),
+        "survival_ms": _distribution([result["survival_ms"] for result in results]),
+        "score": _distribution([result["score"] for result in results]),
+        "game_over_rate": sum(result["game_over"] for result in results) / len(results),
+        "frame_ms_p50": _distribution([result["frame_ms_p50"] for result in results]),
+        "frame_ms_p99": _distribution([result["frame_ms_p99"] for result in results]),
+        "per_game": {
+            "seed": [result["seed"] for result in results],
+            "frames": [result["frames"] for result in results],
+            "score": [result["score"] for result in results],
+        },
+    }
+
+def run_batch(sweep, games=100, policy="aim", max_frames=60 * 60 * 10, base_seed=0, workers=None,
+              backend=None, progress=None):
+    # sweep: list of (constant name, [values]); returns one aggregate per combination
+    names = [name for name, _ in sweep]
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(values for _, values in sweep))]
+    tasks = [(index, params, base_seed + game, policy, max_frames, backend)
+             for index, params in enumerate(combinations) for game in range(games)]
+    results = [[] for _ in combinations]
+    workers = workers or os.cpu_count() or 1
+    # Games are independent, so small chunks keep every core busy until the end
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        for done, (index, result) in enumerate(pool.imap_unordered(_play, tasks, chunksize), 1):
+            results[index].append(result)
+            if progress is not None:
+                progress(done, len(tasks))
+    return [aggregate(params, results[index]) for index, params in enumerate(combinations)]
+
+def write_results(path, data):
+    # Compact JSON, gzip-compressed for *.gz
+    text = json.dumps(data, separators=(",", ":"))
+    if path.endswith(".gz"):
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        with open(path, "w") as f:
+            f.write(text)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless games over a grid of constants")
+    parser.add_argument("--param", action="append", type=parse_param, default=[],
+                        help="NAME=v1,v2,... (repeatable), one of: " + ", ".join(TUNABLE))
+    parser.add_argument("--games", type=int, default=100, help="games per combination")
+    parser.add_argument("--policy", default="aim", help="idle, fire or aim")
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 10, help="frame limit per game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--backend", default=None, help="entity backend (objects or numpy)")
+    parser.add_argument("--out", default="batch_results.json.gz", help="output file")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        if done == total or done % 50 == 0:
+            print(f"\r{done}/{total} games", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    summaries = run_batch(args.param, args.games, args.policy, args.max_frames, args.seed,
+                          args.workers, args.backend, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    write_results(args.out, {
+        "policy": args.policy,
+        "games_per_combination": args.games,
+        "max_frames": args.max_frames,
+        "base_seed": args.seed,
+        "wall_time_s": elapsed,
+        "results": summaries,
+    })
+    for summary in summaries:
+        print(summary["params"], "survival p50 %.1fs" % (summary["survival_ms"]["p50"] / 1000),
+              "score p50", summary["score"]["p50"], "frame p99 %.3fms" % summary["frame_ms_p99"]["p50"])
+    print(f"{len(summaries) * args.games} games in {elapsed:.1f}s -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,41 @@
 import pygame
 import math
 import constants # Import constants module to access shared variables
+import assets # Shared image cache
+from audio import audio # Sound playback (channel groups, voice limits)
 from bullet import Bullet # Bullet class import
+from game_clock import SystemClock # Default time source
 
 class Beaver:
-    def __init__(self):
+    def __init__(self, clock=None, bullet_pool=None):
+        self.clock = clock if clock is not None else SystemClock() # Time source for shot delay/reload
+        self.bullet_pool = bullet_pool # Where new bullets come from (pool.ObjectPool), None = allocate
         self.width = 80
         self.height = 80
         self.x = 100  # Fixed x-position
+        self.speed = 5  # Running speed (vertical movement)
+        self.rect = pygame.Rect(self.x, 0, self.width, self.height) # For collision detection
 
+        # Load beaver image scaled to fit (cached, so restarts don't reload it)
+        self.image = assets.load_image("images/bobar_1.png", (self.width, self.height))
+        
+        # Load gun image scaled to fit
+        self.gun_width = 80  # Gun image width
+        self.gun_height = 40  # Gun image height
+        self.gun_image = assets.load_image("images/pushka.png", (self.gun_width, self.gun_height))
+        # Pre-rotated gun sprites and tip offsets for every aim angle
+        self.gun_rotations = assets.load_rotations("images/pushka.png", (self.gun_width, self.gun_height), self.gun_width)
+        
+        self.reset()
+
+    def reset(self):
+        # Start-of-game state (also used on restart, so images are not reloaded)
         # Initial y-position: Ensure the beaver spawns above the absolute bottom line,
         # considering its height. constants.HEIGHT is the bottom of the screen.
         self.y = constants.HEIGHT - self.height # Spawn at the very bottom edge of the playable area
-        
+        self.rect.y = self.y
         self.hp = 30 # Beaver's health points
         self.angle = 0  # Gun angle in degrees (0 = straight, -90 = up, 90 = down)
-        self.speed = 5  # Running speed (vertical movement)
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height) # For collision detection
 
         # Ammo and Reloading attributes
         self.max_ammo = constants.MAX_AMMO # Maximum bullets before reload
@@ -24,25 +43,16 @@ class Beaver:
         self.reloading = False # Is the beaver currently reloading?
         self.reload_timer = 0 # Time when reload started (ms)
         self.last_shot_time = 0  # Last time a bullet was shot (ms)
-        
-        # Load ricochet sound for shooting
-        self.ricochet_sound = pygame.mixer.Sound("audio/shot.mp3")
-        
-        # Load beaver image and scale to fit
-        self.image = pygame.image.load("images/bobar_1.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.width, self.height))
-        
-        # Load gun image and scale to fit
-        self.gun_image = pygame.image.load("images/pushka.png").convert_alpha()
-        self.gun_width = 80  # Gun image width
-        self.gun_height = 40  # Gun image height
-        self.gun_image = pygame.transform.scale(self.gun_image, (self.gun_width, self.gun_height))
-        
-        # Initialize gun_tip with a default, will be updated in draw
+
+        # Initialize gun_tip with a default, will be updated in update
         self.gun_tip = (self.x + self.width, self.y + self.height // 2)
+        self.prev_y = self.y # y before the last update (for interpolated drawing)
 
-    def update(self):
-        keys = pygame.key.get_pressed()
+    def update(self, keys=None):
+        # keys: held key state (see input_source.InputFrame.held), defaults to the live keyboard
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        self.prev_y = self.y
         if keys[pygame.K_UP]:
             self.angle = min(self.angle + 5, 90) # Aim gun up
         if keys[pygame.K_DOWN]:
@@ -55,36 +65,39 @@ class Beaver:
             self.y = min(self.y + self.speed, constants.HEIGHT - self.height)
         # Update rect position after y movement for collision
         self.rect.y = self.y
+        # Keep gun_tip current even when nothing is drawn (headless simulation)
+        self.gun_tip = self._calculate_gun_tip(self.x + self.width, self.y + self.height // 2 - self.gun_height // 2)
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # alpha < 1 draws the beaver part way between its previous and current position
+        y = self.y - (self.y - self.prev_y) * (1 - alpha)
         # Draw beaver sprite
-        screen.blit(self.image, (self.x, self.y))
+        beaver_rect = screen.blit(self.image, (self.x, y))
         # Draw gun (pushka.png) rotated by angle and positioned at the beaver's side
         gun_x = self.x + self.width
-        gun_y = self.y + self.height // 2 - self.gun_height // 2
+        gun_y = y + self.height // 2 - self.gun_height // 2
         
-        rotated_gun = pygame.transform.rotate(self.gun_image, self.angle)
-        rotated_rect = rotated_gun.get_rect(center=(gun_x, gun_y + self.gun_height // 2))
-        screen.blit(rotated_gun, rotated_rect.topleft)
-        # Update gun_tip for bullet spawn
-        self.gun_tip = self._calculate_gun_tip(gun_x, gun_y)
+        # Rotated sprite comes from the cache, offset so it stays centered on the pivot
+        rotated_gun, (offset_x, offset_y), _ = self.gun_rotations.get(self.angle)
+        pivot_y = gun_y + self.gun_height // 2
+        gun_rect = screen.blit(rotated_gun, (gun_x + offset_x, pivot_y + offset_y))
+        # Areas drawn (for dirty-rect rendering)
+        return [beaver_rect, gun_rect]
 
     def _calculate_gun_tip(self, gun_x, gun_y):
         # Calculate the tip of the gun barrel for bullet spawn, accounting for rotation
         pivot_x = gun_x 
         pivot_y = gun_y + self.gun_height // 2
 
-        tip_offset_x = self.gun_width 
-        tip_offset_y = 0 
-
-        rad = math.radians(-self.angle)
-        rotated_tip_x = pivot_x + tip_offset_x * math.cos(rad) - tip_offset_y * math.sin(rad)
-        rotated_tip_y = pivot_y + tip_offset_x * math.sin(rad) + tip_offset_y * math.cos(rad)
+        # Tip offset (gun_width along the barrel) is precomputed per angle in the rotation cache
+        _, _, (tip_offset_x, tip_offset_y) = self.gun_rotations.get(self.angle)
+        rotated_tip_x = pivot_x + tip_offset_x
+        rotated_tip_y = pivot_y + tip_offset_y
         
         return (rotated_tip_x, rotated_tip_y)
 
     def shoot(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         # Only shoot if there's ammo, not reloading, and enough time has passed since last shot
         if self.current_ammo > 0 and not self.reloading and (current_time - self.last_shot_time >= constants.BULLET_DELAY):
             if hasattr(self, 'gun_tip'):
@@ -99,9 +112,11 @@ class Beaver:
                 bullet_y = gun_y - gun_length * math.sin(rad)
             self.current_ammo -= 1 # Decrease ammo count
             self.last_shot_time = current_time # Update last shot time
-            self.ricochet_sound.play() # Play shooting sound
+            audio.play("shot") # Play shooting sound (throttled in rapid fire)
             if self.current_ammo == 0:
                 self.reloading = True
-                self.reload_timer = pygame.time.get_ticks()
+                self.reload_timer = self.clock.get_ticks()
+            if self.bullet_pool is not None:
+                return self.bullet_pool.acquire(bullet_x, bullet_y, self.angle)
             return Bullet(bullet_x, bullet_y, self.angle)
         return None # Return None if unable to shoot
\ No newline at end of file
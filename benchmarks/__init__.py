@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Shared setup for the benchmarks (and the tests, which import this package first):
+# run without a real window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Game modules live in the repository root and load assets by relative path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
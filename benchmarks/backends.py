@@ -0,0 +1,65 @@
+import sys
+import time
+import random
+
+import benchmarks # noqa: F401 (dummy SDL drivers, game modules importable)
+import pygame
+import assets
+from game_manager import GameManager
+from enemy import Enemy
+from bullet import Bullet
+
+# Frame update time against entity count for the "objects" and "numpy" backends.
+# Usage: python -m benchmarks.backends [count ...]
+
+COUNTS = [10, 50, 100, 250, 500, 1000, 2000]
+REPEATS = 5
+WARMUP_FRAMES = 5 # Let overlapping spawns separate before timing
+FRAMES = 10
+
+def build_scene(backend, count, seed):
+    # count enemies spread over the play area and count bullets flying at them
+    random.seed(seed)
+    game = GameManager(backend)
+    game.beaver.hp = 10 ** 9 # Never die mid-benchmark
+    game.score = 10 ** 6
+    rng = random.Random(seed)
+    for _ in range(count):
+        enemy = Enemy(game.score)
+        enemy.x = rng.randint(200, 1200)
+        enemy.rect.x = enemy.x
+        game.enemies.append(enemy)
+        game.bullets.append(Bullet(rng.uniform(200, 1150), rng.uniform(150, 590), rng.choice(range(-90, 91, 5))))
+    return game
+
+def time_update(backend, count):
+    # Mean time of one GameManager.update, in milliseconds
+    total = 0.0
+    for seed in range(REPEATS):
+        game = build_scene(backend, count, seed)
+        for _ in range(WARMUP_FRAMES):
+            game.update()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            game.update()
+        total += time.perf_counter() - start
+    return total / (REPEATS * FRAMES) * 1000
+
+def main(argv):
+    counts = [int(arg) for arg in argv] or COUNTS
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets.preload()
+    backends = ["objects"]
+    try:
+        import numpy # noqa: F401
+        backends.append("numpy")
+    except ImportError:
+        print("NumPy not installed, only timing the objects backend")
+    print("entities  " + "".join(f"{name:>12}" for name in backends) + "  (ms per update)")
+    for count in counts:
+        row = "".join(f"{time_update(name, count):12.3f}" for name in backends)
+        print(f"{count:8d}  {row}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
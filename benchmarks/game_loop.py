@@ -0,0 +1,278 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import ROOT # Also sets up the dummy SDL drivers
+from benchmarks.backends import build_scene
+
+import pygame
+import assets
+import constants
+from game_manager import GameManager
+from profiler import percentile
+
+# Game loop benchmark suite with saved baselines.
+# Times GameManager.update and GameManager.draw on synthetic scenes (10 to thousands of
+# enemies and bullets, plus the game over screen), measures per-frame allocations with
+# tracemalloc, and the import time of every game module and the startup steps.
+#
+#   python -m benchmarks.game_loop --save baseline.json      # record a baseline
+#   python -m benchmarks.game_loop --compare baseline.json   # exit code 1 on regressions
+#   python -m benchmarks.game_loop --quick                   # fewer scenes and frames
+
+COUNTS = [10, 100, 1000, 3000]
+QUICK_COUNTS = [10, 1000]
+REPEATS = 3
+RECHECKS = 2 # Times scenes that look slower than the baseline are measured again before failing
+WARMUP_FRAMES = 5
+FRAMES = 20
+IMPORT_REPEATS = 3
+THRESHOLD = 0.2 # Relative slowdown reported as a regression
+# Differences smaller than these are noise, whatever the ratio
+MIN_DELTA_MS = 0.05
+MIN_DELTA_KIB = 4.0
+MIN_DELTA_IMPORT_MS = 1.0
+
+def _stats(runs):
+    # runs: the per-frame samples of each repeat.
+    # "best" (the lowest median of a repeat) is what baselines are compared by, "spread" (highest
+    # minus lowest repeat median) is how much that median moves between runs of the same code.
+    samples = sorted(sample for run in runs for sample in run)
+    medians = [percentile(sorted(run), 50) for run in runs]
+    return {
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "best": min(medians),
+        "spread": max(medians) - min(medians),
+    }
+
+def _scenes(backends, counts):
+    # (name, backend, entity count, game over)
+    scenes = [(f"{backend}/{count}", backend, count, False) for backend in backends for count in counts]
+    scenes.append(("game_over", backends[0], max(counts), True))
+    return scenes
+
+def _make_game(backend, count, seed, game_over):
+    game = build_scene(backend, count, seed)
+    if game_over:
+        game.beaver.hp = 0
+        game.game_over = True
+    return game
+
+def time_scene(screen, backend, count, game_over, frames):
+    # Per-frame update and draw times (ms)
+    update_runs = []
+    draw_runs = []
+    for seed in range(REPEATS):
+        update_ms = []
+        draw_ms = []
+        game = _make_game(backend, count, seed, game_over)
+        for _ in range(WARMUP_FRAMES):
+            game.update()
+            game.draw(screen)
+        for _ in range(frames):
+            start = time.perf_counter()
+            game.update()
+            middle = time.perf_counter()
+            game.draw(screen)
+            end = time.perf_counter()
+            update_ms.append((middle - start) * 1000)
+            draw_ms.append((end - middle) * 1000)
+        update_runs.append(update_ms)
+        draw_runs.append(draw_ms)
+    return _stats(update_runs), _stats(draw_runs)
+
+def measure_allocations(screen, backend, count, game_over, frames):
+    # Memory allocated within a frame (peak above the starting point) and kept after all frames, in KiB
+    game = _make_game(backend, count, 0, game_over)
+    for _ in range(WARMUP_FRAMES):
+        game.update()
+        game.draw(screen)
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    per_frame = []
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        game.update()
+        game.draw(screen)
+        _, peak = tracemalloc.get_traced_memory()
+        per_frame.append((peak - before) / 1024)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sum(per_frame) / len(per_frame), (end - start) / 1024
+
+def game_modules():
+    return sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "*.py")))
+
+def import_time(module, own_modules):
+    # Import time (ms) of a module in a fresh interpreter, best of IMPORT_REPEATS.
+    # Only time spent in own_modules (and their submodules) counts: pygame/numpy would drown everything else,
+    # module-level work like app's window setup included.
+    best = None
+    for _ in range(IMPORT_REPEATS):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=ROOT, capture_output=True, text=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            # "import time:  self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip().partition(".")[0] in own_modules:
+                total += int(fields[0].rpartition(":")[2])
+        best = total / 1000 if best is None else min(best, total / 1000)
+    return best
+
+def measure_startup():
+    # Cold asset loading and game construction, in ms
+    assets.clear()
+    start = time.perf_counter()
+    assets.preload()
+    preload_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    game = GameManager()
+    construct_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    game.reset()
+    restart_ms = (time.perf_counter() - start) * 1000
+    return {"preload": preload_ms, "game_manager": construct_ms, "restart": restart_ms}
+
+def measure_scene(screen, backend, count, game_over, frames):
+    update_ms, draw_ms = time_scene(screen, backend, count, game_over, frames)
+    alloc_kib, retained_kib = measure_allocations(screen, backend, count, game_over, frames)
+    return {
+        "update_ms": update_ms,
+        "draw_ms": draw_ms,
+        "alloc_kib_per_frame": alloc_kib,
+        "retained_kib": retained_kib,
+    }
+
+def _report_scene(name, scene, progress):
+    progress(f"{name:<16} update {scene['update_ms']['p50']:8.3f} ms  draw {scene['draw_ms']['p50']:8.3f} ms  "
+             f"alloc {scene['alloc_kib_per_frame']:8.1f} KiB/frame")
+
+def recheck(results, backends, counts, frames, names, progress=print):
+    # Measures the named scenes again and keeps the better of the two runs for every metric
+    screen = pygame.display.get_surface()
+    for name, backend, count, game_over in _scenes(backends, counts):
+        if name not in names:
+            continue
+        scene = results["scenes"][name]
+        again = measure_scene(screen, backend, count, game_over, frames)
+        for key in ("update_ms", "draw_ms"):
+            if again[key]["best"] < scene[key]["best"]:
+                scene[key] = again[key]
+        for key in ("alloc_kib_per_frame", "retained_kib"):
+            scene[key] = min(scene[key], again[key])
+        _report_scene(name + " (again)", scene, progress)
+
+def run(backends, counts, frames, imports=True, progress=print):
+    screen = pygame.display.get_surface()
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "frames": frames,
+        "scenes": {},
+        "startup_ms": measure_startup(),
+        "import_ms": {},
+    }
+    for name, backend, count, game_over in _scenes(backends, counts):
+        results["scenes"][name] = measure_scene(screen, backend, count, game_over, frames)
+        _report_scene(name, results["scenes"][name], progress)
+    if imports:
+        modules = game_modules()
+        results["import_ms"]["pygame"] = import_time("pygame", {"pygame"}) # For reference
+        for module in modules:
+            results["import_ms"][module] = import_time(module, set(modules))
+        for module, value in results["import_ms"].items():
+            progress(f"import {module:<16} {value:8.2f} ms")
+    return results
+
+def _flatten(data, prefix=""):
+    # {"a": {"b": 1}} -> {"a.b": 1} (numbers only)
+    flat = {}
+    for key, value in data.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def compare(baseline, current, threshold=THRESHOLD):
+    # Metrics (all lower-is-better) that got more than threshold worse: [(name, old, new)].
+    # Frame times are compared by their best repeat median (means, p99s and the pooled median move
+    # too much between runs of the same code) and have to be slower by more than the baseline's spread.
+    old = _flatten({key: baseline.get(key, {}) for key in ("scenes", "startup_ms", "import_ms")})
+    new = _flatten({key: current.get(key, {}) for key in ("scenes", "startup_ms", "import_ms")})
+    regressions = []
+    for name, value in new.items():
+        if name not in old or name.endswith((".mean", ".p50", ".p99", ".spread")):
+            continue
+        if name.startswith("import_ms."):
+            min_delta = MIN_DELTA_IMPORT_MS
+        else:
+            min_delta = MIN_DELTA_KIB if "kib" in name else MIN_DELTA_MS
+        if name.endswith(".best"):
+            min_delta = max(min_delta, old.get(name[:-len("best")] + "spread", 0.0))
+        if value > old[name] * (1 + threshold) and value - old[name] > min_delta:
+            regressions.append((name, old[name], value))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GameManager.update/draw, allocations and startup")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative slowdown flagged (0.2 = 20%%)")
+    parser.add_argument("--backend", action="append", help="objects and/or numpy (default: all available)")
+    parser.add_argument("--count", action="append", type=int, help="entity counts (default: %s)" % COUNTS)
+    parser.add_argument("--quick", action="store_true", help="fewer scenes and frames")
+    parser.add_argument("--no-imports", action="store_true", help="skip the import time measurements")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
+    assets.preload()
+    backends = args.backend
+    if not backends:
+        backends = ["objects"]
+        try:
+            import numpy # noqa: F401
+            backends.append("numpy")
+        except ImportError:
+            print("NumPy not installed, only benchmarking the objects backend")
+    counts = args.count or (QUICK_COUNTS if args.quick else COUNTS)
+    frames = FRAMES // 2 if args.quick else FRAMES
+
+    results = run(backends, counts, frames, imports=not args.no_imports)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"saved {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        for _ in range(RECHECKS):
+            # A frame time spike from something else running shouldn't fail the run: measure those scenes again
+            names = {name.split(".")[1] for name, _, _ in regressions if name.startswith("scenes.")}
+            if not names:
+                break
+            recheck(results, backends, counts, frames, names)
+            regressions = compare(baseline, results, args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.3f} -> {new:.3f} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
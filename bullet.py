@@ -3,24 +3,45 @@ import math
 from constants import BLACK
 
 class Bullet:
+    # Fixed attribute set: smaller objects, faster attribute access (bullets are pooled, see pool.py)
+    __slots__ = ("x", "y", "speed", "angle", "radius", "dx", "dy", "rect", "prev_x", "prev_y")
+
     def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
         self.speed = 10  # Bullet speed (pixels per frame)
-        self.angle = angle  # Direction in degrees (0 = right, 90 = up)
         self.radius = 5  # Bullet size
         # Rectangle for collision detection and drawing
-        self.rect = pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
+        self.rect = pygame.Rect(0, 0, self.radius * 2, self.radius * 2)
+        self.reset(x, y, angle)
+
+    def reset(self, x, y, angle):
+        # (Re)initialize a bullet fired from (x, y), also used when reusing a pooled bullet
+        self.x = x
+        self.y = y
+        self.angle = angle  # Direction in degrees (0 = right, 90 = up)
+        # The angle never changes, so work out the per-frame movement once
+        rad = math.radians(self.angle)
+        self.dx = self.speed * math.cos(rad)
+        self.dy = -self.speed * math.sin(rad)
+        # Same truncation as pygame.Rect(x - radius, y - radius, ...)
+        self.rect.x = int(self.x - self.radius)
+        self.rect.y = int(self.y - self.radius)
+        # Position before the last update (for interpolated drawing)
+        self.prev_x = x
+        self.prev_y = y
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         # Move bullet in the direction of the gun's angle
-        rad = math.radians(self.angle)
-        self.x += self.speed * math.cos(rad)
-        self.y -= self.speed * math.sin(rad)
+        self.x += self.dx
+        self.y += self.dy
         # Update rect position for collision detection
         self.rect.x = self.x - self.radius
         self.rect.y = self.y - self.radius
 
-    def draw(self, screen):
-        # Draw the bullet as a black circle at its current position
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius)
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        # Draw the bullet as a black circle at its current position (returns the area drawn)
+        # alpha < 1 draws it part way between its previous and current position
+        x = self.x - (self.x - self.prev_x) * (1 - alpha)
+        y = self.y - (self.y - self.prev_y) * (1 - alpha)
+        return pygame.draw.circle(screen, BLACK, (int(x), int(y)), self.radius)
\ No newline at end of file
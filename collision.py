@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+
+class SpatialGrid:
+    # Uniform grid broad-phase.
+    # Items are stored by integer key (e.g. their index in a list) in every cell their rect touches,
+    # so a query only has to look at the few cells around the rect instead of every item.
+    # Each cell keeps its keys sorted (inserting in increasing order is cheapest), so finding the
+    # first overlap in a cell is a single Rect.collidelist call.
+    # Cells a few entities wide keep most rects in one or two cells, and the scan inside a cell
+    # runs in C, so bigger cells beat more dictionary lookups.
+    # The grid is unbounded: rects outside the play area (like enemies pushed past the right
+    # edge) get cells of their own instead of piling up in the border cells.
+    # Cells are emptied rather than dropped on clear(), so a grid rebuilt every frame keeps
+    # reusing the same lists.
+    def __init__(self, cell_size=300):
+        self.cell_size = cell_size
+        self.cells = {} # (col, row) -> (keys, rects)
+
+    def clear(self):
+        for keys, rects in self.cells.values():
+            keys.clear()
+            rects.clear()
+
+    def insert(self, key, rect):
+        size = self.cell_size
+        cells = self.cells
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((col, row))
+                if bucket is None:
+                    cells[(col, row)] = ([key], [rect])
+                    continue
+                keys, rects = bucket
+                if keys and key < keys[-1]:
+                    index = bisect_right(keys, key)
+                    keys.insert(index, key)
+                    rects.insert(index, rect)
+                else:
+                    keys.append(key)
+                    rects.append(rect)
+
+    def insert_cell(self, cell, keys, rects):
+        # Bulk insert into one (col, row) cell: keys increasing, all greater than the ones already there
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            self.cells[cell] = (list(keys), list(rects))
+        else:
+            bucket[0].extend(keys)
+            bucket[1].extend(rects)
+
+    def remove(self, key, rect):
+        # rect: where the key was inserted
+        size = self.cell_size
+        cells = self.cells
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((col, row))
+                if bucket is None:
+                    continue
+                keys, rects = bucket
+                index = bisect_left(keys, key)
+                if index < len(keys) and keys[index] == key:
+                    del keys[index]
+                    del rects[index]
+
+    def first(self, rect, after=-1, before=None):
+        # Smallest key greater than after (and less than before, if given) whose rect overlaps
+        # rect, None if there is none. Calling it again with the returned key walks every overlap
+        # in key order.
+        size = self.cell_size
+        cells = self.cells
+        best = None
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((col, row))
+                if bucket is None or not bucket[0]:
+                    continue
+                keys, rects = bucket
+                limit = best if best is not None else before
+                if keys[0] > after:
+                    index = rect.collidelist(rects)
+                    if index >= 0 and (limit is None or keys[index] < limit):
+                        best = keys[index]
+                    continue
+                for index in range(bisect_right(keys, after), len(keys)):
+                    key = keys[index]
+                    if limit is not None and key >= limit:
+                        break
+                    if rect.colliderect(rects[index]):
+                        best = key
+                        break
+        return best
@@ -18,10 +18,31 @@ MAX_AMMO = 15                 # Maximum bullets before reload
 RELOAD_TIME_SECONDS = 2       # Time (in seconds) to reload
 BULLET_DELAY = 350            # Delay (in ms) between shots to prevent spamming
 
+# Enemy spawning
+SPAWN_INTERVAL = 60           # Frames between enemy spawns
+WAVE_CONFIG = None            # Wave config for endless/horde mode (e.g. "levels/horde.json"), None = spawn every SPAWN_INTERVAL
+
 # Stage speeds for difficulty scaling
 STAGE_ONE_SPEED = 100         # Score threshold for stage 1
 STAGE_TWO_SPEED = 300         # Score threshold for stage 2
 
+# Storage for bullets/enemies: "objects" (one Python object each) or "numpy" (batched arrays, needs NumPy)
+ENTITY_BACKEND = "objects"
+
+# Game loop: logic updates per second (speeds are in pixels per update) and frame rate cap (0 = uncapped)
+UPDATE_RATE = 60
+MAX_FPS = 60
+
+# Only redraw and push the parts of the screen that changed (always on in the web build)
+DIRTY_RECT_RENDERING = False
+
+# Record every session's input to REPLAY_DIR for replay.py (deterministic replays, finding frame spikes)
+REPLAY_RECORDING = False
+REPLAY_DIR = "replays"
+
+# Send the game state after every update to a local listener (see telemetry.py), e.g. ("127.0.0.1", 47800)
+TELEMETRY_ADDRESS = None
+
 # Global variables for UI bounds (set in GameManager based on HUD layout)
 ENEMY_MIN_Y = 0               # Minimum Y for enemy spawn (keeps enemies below HUD)
 BEAVER_MAX_Y_UPPER = 0        # Maximum Y the beaver can move up (keeps beaver below HUD)
\ No newline at end of file
@@ -1,12 +1,25 @@
 import pygame
 import random
 import constants # Import constants module
+import assets # Shared image cache
 
 class Enemy:
-    def __init__(self, score=0):
-        self.x = constants.WIDTH  # Start at the far right edge of the screen
+    # Fixed attribute set: smaller objects, faster attribute access (enemies are pooled, see pool.py)
+    __slots__ = ("x", "y", "width", "height", "min_y", "max_y", "image", "speed", "rect", "prev_x", "prev_y")
+
+    def __init__(self, score=0, rng=random, speed=None):
         self.width = 100
         self.height = 80
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        # Get the scaled enemy image (vidra) from the shared cache instead of decoding it per spawn
+        self.image = assets.load_image("images/vidra.png", (self.width, self.height))
+        self.reset(score, rng, speed)
+
+    def reset(self, score=0, rng=random, speed=None):
+        # (Re)initialize a freshly spawned enemy, also used when reusing a pooled enemy
+        # rng: random number source (the random module, or a seeded random.Random)
+        # speed: fixed speed (wave spawns), None = pick one from the score
+        self.x = constants.WIDTH  # Start at the far right edge of the screen
         
         # Calculate min_y and max_y for enemy spawning and movement
         # min_y: Top boundary (just below the HUD, set by GameManager)
@@ -15,23 +28,27 @@ class Enemy:
         self.max_y = constants.HEIGHT - self.height
         
         # Randomly spawn within the valid vertical range (between HUD and bottom)
-        self.y = random.randint(self.min_y, self.max_y)
-        
-        # Load and scale the enemy image (vidra)
-        self.image = pygame.image.load("images/vidra.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.width, self.height))
+        self.y = rng.randint(self.min_y, self.max_y)
         
         # Set speed based on score (difficulty increases as score increases)
-        if score < constants.STAGE_ONE_SPEED:
-            self.speed = random.randint(1, 3)
+        if speed is not None:
+            self.speed = speed
+        elif score < constants.STAGE_ONE_SPEED:
+            self.speed = rng.randint(1, 3)
         elif score < constants.STAGE_TWO_SPEED:
-            self.speed = random.randint(3, 5)
+            self.speed = rng.randint(3, 5)
         else:
-            self.speed = random.randint(5, 8)
-        # Create a rect for collision detection and movement
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+            self.speed = rng.randint(5, 8)
+        # Move the rect for collision detection and movement
+        self.rect.x = self.x
+        self.rect.y = self.y
+        # Position before the last update (for interpolated drawing)
+        self.prev_x = self.x
+        self.prev_y = self.y
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x -= self.speed  # Move enemy leftwards
         self.rect.x = self.x  # Update rect's x position
         
@@ -42,6 +59,9 @@ class Enemy:
         self.y = min(self.y, self.max_y)
         self.rect.y = self.y # Update rect's y after clamping
 
-    def draw(self, screen):
-        # Draw the enemy sprite at its current position
-        screen.blit(self.image, (self.x, self.y))
\ No newline at end of file
+    def draw(self, screen, alpha=1.0):
+        # Draw the enemy sprite at its current position (returns the area drawn)
+        # alpha < 1 draws it part way between its previous and current position
+        x = self.x - (self.x - self.prev_x) * (1 - alpha)
+        y = self.y - (self.y - self.prev_y) * (1 - alpha)
+        return screen.blit(self.image, (x, y))
\ No newline at end of file
@@ -0,0 +1,310 @@
+from operator import attrgetter
+import pygame
+import constants # Import constants module to access shared variables
+from collision import SpatialGrid # Broad-phase for the sequential part of separate()
+
+# NumPy is optional: only the "numpy" entity backend needs it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Struct-of-arrays storage for bullets and enemies.
+# Positions, velocities, sizes and rects live in NumPy arrays (in spawn order, like the
+# lists of the default backend) so movement, culling and overlap tests run as batched
+# array operations. GameManager keeps the scoring rules; see GameManager._update_entity_arrays.
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The 'numpy' entity backend requires NumPy to be installed")
+
+def round_half_away(values):
+    # Same rounding pygame.Rect uses when a float is assigned to x/y
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+def contacts(ax, ay, aw, ah, bx, by, bw, bh):
+    # Every overlapping (a, b) pair (pygame.Rect.colliderect rules), as two index arrays sorted
+    # by a then b. Instead of testing all a x b pairs, the b rects are sorted by row band (as
+    # tall as the tallest b) and x, and each a rect only looks at the b rects that start in
+    # the bands and the x range it can reach. Sizes may be single numbers.
+    aw, ah = np.broadcast_to(aw, ax.shape), np.broadcast_to(ah, ax.shape)
+    if not len(ax) or not len(bx):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    band = max(int(bh.max()), 1)
+    widest = int(bw.max())
+    origin = min(int(ax.min()) - widest, int(bx.min()))
+    stride = max(int((ax + aw).max()), int((bx + bw).max())) - origin + 1 # Keeps bands apart
+    b_band = by // band
+    order = np.lexsort((bx, b_band))
+    keys = (b_band * stride + (bx - origin))[order]
+    # A b rect touching a starts at most one band above a's and at most a's height below it,
+    # so each a looks up its x window in each of those bands (all bands in one go)
+    offsets = np.arange(-1, (int(ah.max()) - 1) // band + 2)[:, None]
+    base = ((ay // band) + offsets) * stride
+    start = np.searchsorted(keys, (base + (ax - widest - origin)).ravel(), side="right")
+    end = np.searchsorted(keys, (base + (ax + aw - origin)).ravel(), side="left")
+    counts = end - start
+    total = int(counts.sum())
+    # Expand each a into its [start, end) windows of sorted b rects
+    a = np.repeat(np.tile(np.arange(len(ax)), len(offsets)), counts)
+    b = order[np.arange(total) - np.repeat(np.cumsum(counts) - counts - start, counts)]
+    hit = (ax[a] < bx[b] + bw[b]) & (bx[b] < ax[a] + aw[a]) & (ay[a] < by[b] + bh[b]) & (by[b] < ay[a] + ah[a])
+    a = a[hit]
+    b = b[hit]
+    order = np.lexsort((b, a))
+    return a[order], b[order]
+
+class _Column:
+    # One field of an _EntityArrays: a view of the live rows of its buffer.
+    # Assigning a whole array replaces the column (and sets the entity count).
+    def __init__(self, dtype):
+        self.dtype = dtype
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, entities, owner=None):
+        if entities is None:
+            return self
+        return entities.buffers[self.name][:entities.count]
+
+    def __set__(self, entities, values):
+        buffer = entities.buffers[self.name]
+        if isinstance(values, np.ndarray) and values.base is buffer and len(values) == entities.count:
+            return # Changed in place (x -= speed)
+        values = np.asarray(values, dtype=self.dtype)
+        entities.reserve(len(values))
+        entities.buffers[self.name][:len(values)] = values
+        entities.count = len(values)
+
+class _EntityArrays:
+    # Columns live in buffers with spare room that double when full, so adding an entity
+    # writes one row instead of reallocating every array
+    FIELDS = () # (column, attribute of the entity object) pairs
+
+    def __init__(self):
+        _require_numpy()
+        self.count = 0
+        self.getters = [(column, attrgetter(attribute)) for column, attribute in self.FIELDS]
+        self.buffers = {column: np.empty(16, dtype=getattr(type(self), column).dtype) for column, _ in self.FIELDS}
+
+    def __len__(self):
+        return self.count
+
+    def reserve(self, count):
+        # Make room for count entities
+        capacity = len(next(iter(self.buffers.values())))
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for column, buffer in self.buffers.items():
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self.count] = buffer[:self.count]
+            self.buffers[column] = grown
+
+    def append(self, entity):
+        # Copy a freshly created entity object into the arrays
+        index = self.count
+        self.reserve(index + 1)
+        for column, getter in self.getters:
+            self.buffers[column][index] = getter(entity)
+        self.count = index + 1
+
+    def extend(self, entities):
+        # Copy several entity objects at once
+        if not entities:
+            return
+        start = self.count
+        end = start + len(entities)
+        self.reserve(end)
+        for column, getter in self.getters:
+            self.buffers[column][start:end] = [getter(entity) for entity in entities]
+        self.count = end
+
+    def clear(self):
+        self.count = 0
+
+    def keep(self, mask):
+        # Drop every entity where mask is False, preserving order (compacted in place)
+        count = self.count
+        kept = int(np.count_nonzero(mask))
+        if kept == count:
+            return
+        for buffer in self.buffers.values():
+            buffer[:kept] = buffer[:count][mask]
+        self.count = kept
+
+class BulletArrays(_EntityArrays):
+    FIELDS = (("x", "x"), ("y", "y"), ("vx", "dx"), ("vy", "dy"), ("rect_x", "rect.x"), ("rect_y", "rect.y"),
+              ("prev_x", "prev_x"), ("prev_y", "prev_y"))
+    x = _Column("float64")     # Center position (float, like Bullet.x/y)
+    y = _Column("float64")
+    vx = _Column("float64")    # Per-frame movement
+    vy = _Column("float64")
+    rect_x = _Column("int64")  # Collision rect top-left (int, like Bullet.rect)
+    rect_y = _Column("int64")
+    prev_x = _Column("float64") # Position before the last move (for interpolated drawing)
+    prev_y = _Column("float64")
+
+    def __init__(self):
+        super().__init__()
+        self.radius = 5 # Same size as Bullet
+
+    def cull(self, min_y):
+        # Only keep bullets within screen and below HUD
+        x, y = self.x, self.y
+        self.keep((x > 0) & (x < constants.WIDTH) & (y > 0) & (y >= min_y))
+
+    def move(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x += self.vx
+        self.y += self.vy
+        self.rect_x[:] = round_half_away(self.x - self.radius)
+        self.rect_y[:] = round_half_away(self.y - self.radius)
+
+    def draw(self, screen, alpha=1.0):
+        # Draw every bullet as a black circle, returns the areas drawn
+        # alpha < 1 draws them part way between their previous and current position
+        x = self.x - (self.x - self.prev_x) * (1 - alpha)
+        y = self.y - (self.y - self.prev_y) * (1 - alpha)
+        radius = self.radius
+        circle = pygame.draw.circle
+        black = constants.BLACK
+        return [circle(screen, black, pos, radius) for pos in zip(x.astype(int).tolist(), y.astype(int).tolist())]
+
+class EnemyArrays(_EntityArrays):
+    FIELDS = tuple((name, name) for name in ("x", "y", "speed", "width", "height", "min_y", "max_y", "prev_x", "prev_y"))
+    x = _Column("int64")
+    y = _Column("int64")
+    speed = _Column("int64")
+    width = _Column("int64")
+    height = _Column("int64")
+    min_y = _Column("int64")
+    max_y = _Column("int64")
+    prev_x = _Column("int64") # Position before the last move (for interpolated drawing)
+    prev_y = _Column("int64")
+
+    def __init__(self):
+        super().__init__()
+        self.image = None # All enemies share the cached vidra sprite
+        self.grid = SpatialGrid() # Reused by separate()
+
+    def append(self, enemy):
+        self.image = enemy.image
+        super().append(enemy)
+
+    def extend(self, enemies):
+        if enemies:
+            self.image = enemies[0].image
+        super().extend(enemies)
+
+    def move(self):
+        # Move enemies leftwards and keep them between the HUD and the bottom of the screen
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x -= self.speed
+        np.clip(self.y, self.min_y, self.max_y, out=self.y)
+
+    def separate(self):
+        # Prevent merging: walk the enemies in order and push each one behind any earlier
+        # enemy it overlaps (same rule as the default backend). Only enemies that may need
+        # moving are visited in Python.
+        n = len(self)
+        if n < 2:
+            return
+        x, y, w, h = self.x, self.y, self.width, self.height
+        # Enemies overlapping an earlier one: sweep them in x order, comparing each with the
+        # k-th next one for growing k until none of those starts before its right edge
+        bottom = y + h
+        order = np.argsort(x, kind="stable")
+        sorted_x = x[order]
+        sorted_right = sorted_x + w[order]
+        sorted_y = y[order]
+        sorted_bottom = bottom[order]
+        overlapped = np.zeros(n, dtype=bool)
+        for k in range(1, n):
+            near = sorted_x[k:] < sorted_right[:-k]
+            if not near.any():
+                break
+            near &= (sorted_y[k:] < sorted_bottom[:-k]) & (sorted_y[:-k] < sorted_bottom[k:])
+            pairs = np.flatnonzero(near)
+            overlapped[np.maximum(order[pairs], order[pairs + k])] = True
+        if not overlapped.any():
+            return
+        # The rest is sequential and runs like the default backend's merge pass, on a grid
+        # holding the enemies that stay put (added in bulk) and each moving one once it is done.
+        # When most of the enemies from the first overlapping one on are overlapping anyway,
+        # all of those are walked, so none has to be taken out of the grid and walked later.
+        first = int(np.argmax(overlapped))
+        crowded = 8 * int(np.count_nonzero(overlapped)) > n - first
+        if crowded:
+            overlapped[first:] = True
+        rects = list(map(pygame.Rect, x.tolist(), y.tolist(), w.tolist(), h.tolist()))
+        grid = self.grid
+        grid.clear()
+        self._fill_grid(np.flatnonzero(~overlapped), rects)
+        pending = overlapped.tolist()
+        for i in range(first, n):
+            if not pending[i]:
+                continue
+            rect = rects[i]
+            # Earlier enemies in list order, each checked against where this one is by then
+            j = grid.first(rect, -1, i)
+            moved = j is not None
+            while j is not None:
+                rect.x = rects[j].right
+                j = grid.first(rect, j, i)
+            grid.insert(i, rect)
+            if moved:
+                x[i] = rect.x
+                if crowded:
+                    continue
+                # Later enemies it now overlaps have to be separated too
+                k = grid.first(rect, i)
+                while k is not None:
+                    pending[k] = True
+                    grid.remove(k, rects[k])
+                    k = grid.first(rect, k)
+
+    def _fill_grid(self, keys, rects):
+        # Add the enemies in keys (increasing) to the grid, grouped by cell with NumPy
+        grid = self.grid
+        size = grid.cell_size
+        x, y = self.x[keys], self.y[keys]
+        col0 = x // size
+        col1 = (x + self.width[keys] - 1) // size
+        row0 = y // size
+        row1 = (y + self.height[keys] - 1) // size
+        if (col1 - col0 > 1).any() or (row1 - row0 > 1).any(): # Enemies bigger than a cell
+            for key in keys.tolist():
+                grid.insert(key, rects[key])
+            return
+        wide = col1 != col0
+        tall = row1 != row0
+        corner = wide & tall
+        cols = np.concatenate((col0, col1[wide], col0[tall], col1[corner]))
+        rows = np.concatenate((row0, row0[wide], row1[tall], row1[corner]))
+        owners = np.concatenate((keys, keys[wide], keys[tall], keys[corner]))
+        order = np.lexsort((owners, rows, cols))
+        cols = cols[order]
+        rows = rows[order]
+        starts = (np.flatnonzero((cols[1:] != cols[:-1]) | (rows[1:] != rows[:-1])) + 1).tolist()
+        owners = owners[order].tolist()
+        cols = cols.tolist()
+        rows = rows.tolist()
+        for start, end in zip([0] + starts, starts + [len(owners)]):
+            cell_keys = owners[start:end]
+            grid.insert_cell((cols[start], rows[start]), cell_keys, [rects[key] for key in cell_keys])
+
+    def draw(self, screen, alpha=1.0):
+        # Draw every enemy sprite, returns the areas drawn
+        # alpha < 1 draws them part way between their previous and current position
+        if not len(self):
+            return []
+        x = self.x - (self.x - self.prev_x) * (1 - alpha)
+        y = self.y - (self.y - self.prev_y) * (1 - alpha)
+        image = self.image
+        return screen.blits([(image, pos) for pos in zip(x.tolist(), y.tolist())])
@@ -0,0 +1,48 @@
+import pygame
+
+# Clocks hand out the current game time in milliseconds (like pygame.time.get_ticks).
+# Game logic asks its clock instead of pygame, so it can run on simulated time.
+
+class SystemClock:
+    # Real time since pygame.init(), used by the normal game
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def tick(self):
+        # Real time advances on its own
+        pass
+
+class FixedClock:
+    # Simulated time that only moves when tick() is called, one fixed step per frame
+    def __init__(self, step_ms=1000 / 60, start_ms=0):
+        self.step_ms = step_ms
+        self.time_ms = start_ms
+
+    def get_ticks(self):
+        return int(self.time_ms)
+
+    def tick(self):
+        self.time_ms += self.step_ms
+
+class FrameClock:
+    # Real time, sampled once per frame by tick(): everything within a frame sees the same
+    # time, so a frame can be reproduced exactly from its recorded ticks (see replay.py)
+    def __init__(self):
+        self.time_ms = pygame.time.get_ticks()
+
+    def get_ticks(self):
+        return self.time_ms
+
+    def tick(self):
+        self.time_ms = pygame.time.get_ticks()
+
+class ReplayClock:
+    # Time taken from a recording, set frame by frame by the replayer
+    def __init__(self, time_ms=0):
+        self.time_ms = time_ms
+
+    def get_ticks(self):
+        return self.time_ms
+
+    def tick(self):
+        pass
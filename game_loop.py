@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+# Fixed-step game loop with decoupled, capped rendering.
+#
+# Game logic moves things a fixed amount per update (pixels per frame), so updates must run
+# at a fixed rate no matter how long a frame takes: real elapsed time goes into an
+# accumulator and one update runs per full step in it. Rendering happens at most max_fps
+# times per second and gets the left-over fraction of a step (alpha) to interpolate with.
+# The sleep after each frame aims at the next frame deadline rather than a fixed delay, so
+# time spent updating and drawing doesn't slow the game down. It always awaits at least once
+# per frame, which the browser (Emscripten) build needs to stay responsive.
+
+class LoopStats:
+    # Measured loop timings in milliseconds, smoothed so they can be shown or logged
+    SMOOTHING = 0.1 # Weight of the newest frame in the running averages
+
+    def __init__(self):
+        self.frames = 0
+        self.updates = 0
+        self.dropped_ms = 0.0 # Simulation time skipped because updates couldn't keep up
+        self.update_ms = 0.0  # Average time spent in updates per rendered frame
+        self.render_ms = 0.0  # Average time spent drawing per rendered frame
+        self.idle_ms = 0.0    # Average time spent sleeping per rendered frame
+        self.frame_ms = 0.0   # Average time between rendered frames
+        self.last = (0.0, 0.0, 0.0) # (update, render, idle) of the latest frame
+
+    @property
+    def fps(self):
+        return 1000.0 / self.frame_ms if self.frame_ms else 0.0
+
+    def record(self, update_ms, render_ms, idle_ms, frame_ms):
+        self.frames += 1
+        self.last = (update_ms, render_ms, idle_ms)
+        if self.frames == 1:
+            self.update_ms, self.render_ms, self.idle_ms, self.frame_ms = update_ms, render_ms, idle_ms, frame_ms
+            return
+        k = self.SMOOTHING
+        self.update_ms += (update_ms - self.update_ms) * k
+        self.render_ms += (render_ms - self.render_ms) * k
+        self.idle_ms += (idle_ms - self.idle_ms) * k
+        self.frame_ms += (frame_ms - self.frame_ms) * k
+
+class LoopScheduler:
+    def __init__(self, update, render, step_rate=60, max_fps=60, max_steps_per_frame=5, timer=time.perf_counter):
+        # update(): runs one fixed step, returns False to stop the loop
+        # render(alpha): draws a frame, alpha in [0, 1) is how far we are into the next step
+        # max_fps: render cap (0 = render as often as possible)
+        # max_steps_per_frame: catch-up limit after a long stall, extra time is dropped
+        self.update = update
+        self.render = render
+        self.step = 1.0 / step_rate
+        self.frame_time = 1.0 / max_fps if max_fps else 0.0
+        self.max_steps_per_frame = max_steps_per_frame
+        self.timer = timer
+        self.stats = LoopStats()
+        self.running = False
+
+    async def run(self):
+        timer = self.timer
+        step = self.step
+        stats = self.stats
+        accumulator = 0.0
+        previous = timer()
+        deadline = previous
+        self.running = True
+        while self.running:
+            frame_start = timer()
+            accumulator += frame_start - previous
+            previous = frame_start
+
+            # Fixed-step updates for the time that has passed
+            steps = 0
+            while accumulator >= step:
+                if steps == self.max_steps_per_frame:
+                    # Too far behind (window dragged, tab in background): drop the backlog
+                    stats.dropped_ms += (accumulator - accumulator % step) * 1000
+                    accumulator %= step
+                    break
+                if not self.update():
+                    self.running = False
+                    return
+                accumulator -= step
+                steps += 1
+            stats.updates += steps
+            update_end = timer()
+
+            self.render(accumulator / step)
+            render_end = timer()
+
+            # Sleep until the next frame deadline; if we are more than a frame late, start over from now
+            deadline += self.frame_time
+            if deadline < render_end - self.frame_time:
+                deadline = render_end
+            await asyncio.sleep(max(0.0, deadline - render_end))
+            frame_end = timer()
+
+            stats.record((update_end - frame_start) * 1000, (render_end - update_end) * 1000,
+                         (frame_end - render_end) * 1000, (frame_end - frame_start) * 1000)
+
+    def stop(self):
+        self.running = False
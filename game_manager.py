@@ -1,13 +1,39 @@
 import pygame
+import random
 from beaver import Beaver
 from enemy import Enemy
+from bullet import Bullet
+from pool import ObjectPool # Reuses bullets/enemies instead of allocating new ones
+import assets # Shared image/font cache
+from audio import audio # Sound playback (channel groups, voice limits)
+from hud import Hud # Cached HUD rendering
+from collision import SpatialGrid # Broad-phase for collision checks
+from waves import WaveScheduler # Endless/horde mode spawning
+from telemetry import TelemetryPublisher # Optional live state stream
 import constants # Import constants module to access and modify shared variables
+import entity_arrays # Optional NumPy storage for bullets/enemies
+from game_clock import SystemClock # Default time source
+from input_source import KeyboardInput, NO_INPUT # Default input source
+from profiler import profiler # Per-phase timings (no-op unless enabled)
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, backend=None, clock=None, input_source=None, rng=None):
+        # Injectable time, input and randomness (defaults: real time, keyboard, global random),
+        # see simulation.py for the headless setup
+        self.clock = clock if clock is not None else SystemClock()
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        self.held_keys = NO_INPUT.held # Keys held during the current frame (kept across restarts)
+        self.rng = rng if rng is not None else random
+
+        # --- Fonts and images (cached in assets, loaded once per game manager) ---
+        self.font = assets.load_font("arial", 24) # Main font
+        self.reloading_font = assets.load_font("arial", 24, bold=True) # Font for reloading message
+        self.hud = Hud(self.font, self.reloading_font) # Cached HUD text surfaces
+        # Scaled end game image for game over background
+        self.end_image = assets.load_image("images/endImg.jpeg", (constants.WIDTH, constants.HEIGHT), alpha=False)
+
         # --- UI boundary calculation for HUD and game area ---
-        temp_font = pygame.font.SysFont("arial", 24)
-        ammo_text_height = temp_font.render(f"Ammo: {constants.MAX_AMMO}/{constants.MAX_AMMO}", True, constants.BLACK).get_height()
+        ammo_text_height = self.font.render(f"Ammo: {constants.MAX_AMMO}/{constants.MAX_AMMO}", True, constants.BLACK).get_height()
         vertical_offset = 30 # Space below ammo text for game area
         # Calculate the minimum Y for game elements to stay below the HUD
         calculated_min_y_for_game_area = 40 + ammo_text_height + 5 + vertical_offset
@@ -15,174 +41,325 @@ class GameManager:
         constants.ENEMY_MIN_Y = calculated_min_y_for_game_area
         constants.BEAVER_MAX_Y_UPPER = calculated_min_y_for_game_area
 
+        # --- Entities ---
+        # Pools of reusable bullets and enemies
+        self.bullet_pool = ObjectPool(Bullet)
+        self.enemy_pool = ObjectPool(Enemy)
+        self.beaver = Beaver(self.clock, self.bullet_pool) # Main player character
+        # Entity storage backend ("objects" or "numpy", see constants.ENTITY_BACKEND)
+        self.backend = backend if backend is not None else constants.ENTITY_BACKEND
+        if self.backend == "numpy":
+            self.bullets = entity_arrays.BulletArrays() # Active bullets as arrays
+            self.enemies = entity_arrays.EnemyArrays()  # Active enemies as arrays
+        elif self.backend == "objects":
+            self.bullets = []      # List of active bullets
+            self.enemies = []      # List of active enemies
+        else:
+            raise ValueError(f"Unknown entity backend: {self.backend!r}")
+        self.enemy_grid = SpatialGrid() # Broad-phase for enemy collisions
+        self.removed_enemies = set() # Indices of enemies to drop this frame (reused)
+        # Wave spawning (see waves.py), None = one enemy every spawn_interval frames
+        self.waves = WaveScheduler.load(constants.WAVE_CONFIG) if constants.WAVE_CONFIG else None
+        if self.waves is not None and self.backend == "objects":
+            # Build every enemy a wave can need now, so horde bursts only recycle pooled ones
+            self.enemy_pool.reserve(self.waves.max_enemies, 0, random.Random(0))
+        # Live state stream for viewers/analysis (see telemetry.py), None = off
+        self.telemetry = TelemetryPublisher(constants.TELEMETRY_ADDRESS) if constants.TELEMETRY_ADDRESS else None
+
+        self.reset()
+
+    def reset(self):
         # --- Game state initialization ---
-        self.beaver = Beaver() # Main player character
-        self.bullets = []      # List of active bullets
-        self.enemies = []      # List of active enemies
+        # Also restarts the game: everything loaded above is kept, entities go back to their pools
+        self.beaver.reset()
+        if self.backend == "numpy":
+            self.bullets.clear()
+            self.enemies.clear()
+        else:
+            self.bullet_pool.release_all(self.bullets)
+            self.enemy_pool.release_all(self.enemies)
         self.score = 0         # Player's score
         self.game_over = False # Game over state
         self.spawn_counter = 0 # Counter for enemy spawn timing
-        self.spawn_interval = 60  # Frames between enemy spawns
-        self.font = pygame.font.SysFont("arial", 24) # Main font
-        self.reloading_font = pygame.font.SysFont("arial", 24, bold=True) # Font for reloading message
+        self.spawn_interval = constants.SPAWN_INTERVAL  # Frames between enemy spawns
         self.scream_played = False # Track if game over sound played
-        self.scream_sound = pygame.mixer.Sound("audio/screaming_beaver.mp3") # Game over sound
-        # Load and scale the end game image for game over background
-        self.end_image = pygame.image.load("images/endImg.jpeg").convert()
-        self.end_image = pygame.transform.scale(self.end_image, (constants.WIDTH, constants.HEIGHT))
+        if self.waves is not None:
+            self.waves.reset()
 
     def update(self):
         if self.game_over:
             # Play game over sound and clear enemies
             if not self.scream_played:
-                self.scream_sound.play()
+                audio.play("scream")
                 self.scream_played = True
-            self.enemies = []
+            if self.backend == "numpy":
+                self.enemies.clear()
+            else:
+                self.enemy_pool.release_all(self.enemies)
+            self._publish()
+            return
+
+        with profiler.phase("reload"):
+            # --- Handle reloading mechanics ---
+            if self.beaver.reloading:
+                current_time = self.clock.get_ticks()
+                if current_time - self.beaver.reload_timer >= constants.RELOAD_TIME_SECONDS * 1000:
+                    self.beaver.current_ammo = self.beaver.max_ammo
+                    self.beaver.reloading = False
+                    self.beaver.reload_timer = 0
+
+        with profiler.phase("beaver"):
+            self.beaver.update(self.held_keys) # Update player movement and state
+
+        with profiler.phase("spawn"):
+            # --- Enemy spawning ---
+            if self.waves is not None:
+                self._spawn_wave()
+            else:
+                self.spawn_counter += 1
+                if self.spawn_counter >= self.spawn_interval:
+                    enemy = self.enemy_pool.acquire(self.score, self.rng) # Spawn new enemy
+                    self.enemies.append(enemy)
+                    if self.backend == "numpy":
+                        self.enemy_pool.release(enemy) # The arrays keep a copy
+                    self.spawn_counter = 0
+
+        if self.backend == "numpy":
+            self._update_entity_arrays()
+        else:
+            self._update_entities()
+        if profiler.enabled:
+            profiler.record_counts(bullets=len(self.bullets), enemies=len(self.enemies))
+        self._publish()
+
+    def _publish(self):
+        if self.telemetry is not None:
+            with profiler.phase("telemetry"):
+                self.telemetry.publish(self)
+
+    def _spawn_wave(self):
+        # Spawns whatever the wave scheduler releases this frame (a few per frame at most)
+        speeds = self.waves.update(len(self.enemies), self.rng)
+        if not speeds:
             return
+        spawned = [self.enemy_pool.acquire(self.score, self.rng, speed) for speed in speeds]
+        self.enemies.extend(spawned)
+        if self.backend == "numpy":
+            self.enemy_pool.release_all(spawned) # The arrays keep a copy
+
+    def _update_entities(self):
+        # Lists are compacted in place, dropped entities go back to their pool and the grid
+        # cells and removal set are reused, so frames keep using the same containers instead of
+        # building new ones (what remains is ints for the new positions)
+        bullets = self.bullets
+        enemies = self.enemies
+
+        with profiler.phase("bullets"):
+            # --- Update bullets ---
+            # Only keep bullets within screen and below HUD
+            min_y = constants.ENEMY_MIN_Y
+            width = constants.WIDTH
+            kept = 0
+            for bullet in bullets:
+                if 0 < bullet.x < width and bullet.y > 0 and bullet.y >= min_y:
+                    bullet.update()
+                    bullets[kept] = bullet
+                    kept += 1
+                else:
+                    self.bullet_pool.release(bullet)
+            del bullets[kept:]
 
-        # --- Handle reloading mechanics ---
-        if self.beaver.reloading:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.beaver.reload_timer >= constants.RELOAD_TIME_SECONDS * 1000:
-                self.beaver.current_ammo = self.beaver.max_ammo
-                self.beaver.reloading = False
-                self.beaver.reload_timer = 0
-
-        self.beaver.update() # Update player movement and state
-
-        # --- Update bullets ---
-        # Only keep bullets within screen and below HUD
-        self.bullets = [bullet for bullet in self.bullets if 
-                        0 < bullet.x < constants.WIDTH and 
-                        bullet.y > 0 and 
-                        bullet.y >= constants.ENEMY_MIN_Y]
-        for bullet in self.bullets:
-            bullet.update()
-
-        # --- Enemy spawning ---
-        self.spawn_counter += 1
-        if self.spawn_counter >= self.spawn_interval:
-            self.enemies.append(Enemy(self.score)) # Spawn new enemy
-            self.spawn_counter = 0
-
-        # --- Update enemies, prevent merging, handle off-screen ---
-        enemies_to_keep = []
-        for i, enemy in enumerate(self.enemies):
-            enemy.update()
-            from constants import ENEMY_MIN_Y
-            if enemy.rect.y < ENEMY_MIN_Y:
-                enemy.rect.y = int(ENEMY_MIN_Y)
-            # Prevent merging: if two enemies overlap, move the one behind
-            for prev_enemy in self.enemies[:i]:
-                if enemy.rect.colliderect(prev_enemy.rect):
+        with profiler.phase("enemies"):
+            # --- Update enemies, prevent merging, handle off-screen ---
+            # Enemies are inserted into the broad-phase grid as they are processed, so each one
+            # only checks the nearby enemies before it instead of the whole list.
+            # Removals are collected by index and applied in one pass at the end.
+            grid = self.enemy_grid
+            grid.clear()
+            removed = self.removed_enemies
+            removed.clear()
+            for i, enemy in enumerate(enemies):
+                enemy.update()
+                from constants import ENEMY_MIN_Y
+                if enemy.rect.y < ENEMY_MIN_Y:
+                    enemy.rect.y = int(ENEMY_MIN_Y)
+                # Prevent merging: if two enemies overlap, move the one behind.
+                # Earlier enemies are checked in list order against the enemy's current
+                # position: after each push only the ones after the pusher are looked at again.
+                j = grid.first(enemy.rect)
+                while j is not None:
+                    prev_enemy = enemies[j]
                     enemy.x = prev_enemy.x + prev_enemy.width
                     enemy.rect.x = enemy.x
-            # If enemy goes off screen, penalize score and check for game over
-            if enemy.x <= -enemy.width:
-                if self.score > 0:
-                    self.score = max(0, self.score - 10)
-                    if self.score == 0:
+                    j = grid.first(enemy.rect, j)
+                grid.insert(i, enemy.rect)
+                # If enemy goes off screen, penalize score and check for game over
+                if enemy.x <= -enemy.width:
+                    if self.score > 0:
+                        self.score = max(0, self.score - 10)
+                        if self.score == 0:
+                            self.game_over = True
+                    # If score is already 0, just remove the enemy
+                    removed.add(i)
+
+        with profiler.phase("collide_beaver"):
+            # --- Collision: Enemy with Beaver ---
+            beaver_rect = self.beaver.rect
+            i = grid.first(beaver_rect)
+            while i is not None:
+                if i not in removed:
+                    self.beaver.hp -= 10 # Lose HP on collision
+                    removed.add(i)
+                    if self.beaver.hp <= 0:
                         self.game_over = True
-                # If score is already 0, just remove the enemy
-            else:
-                enemies_to_keep.append(enemy)
-        self.enemies = enemies_to_keep
-
-        # --- Collision: Enemy with Beaver ---
-        for enemy in self.enemies[:]: 
-            if enemy.rect.colliderect(self.beaver.rect):
-                self.beaver.hp -= 10 # Lose HP on collision
-                self.enemies.remove(enemy) 
+                i = grid.first(beaver_rect, i)
+
+        with profiler.phase("collide_bullets"):
+            # --- Collision: Bullet with Enemy ---
+            # Each bullet removes the first (in list order) enemy it touches that is still alive
+            kept = 0
+            for bullet in bullets:
+                i = grid.first(bullet.rect)
+                while i is not None and i in removed:
+                    i = grid.first(bullet.rect, i)
+                if i is not None:
+                    removed.add(i)
+                    self.score += 10 
+                    self.bullet_pool.release(bullet)
+                else:
+                    bullets[kept] = bullet
+                    kept += 1
+            del bullets[kept:]
+
+        with profiler.phase("removals"):
+            # Apply all enemy removals at once
+            if removed:
+                kept = 0
+                for i, enemy in enumerate(enemies):
+                    if i in removed:
+                        self.enemy_pool.release(enemy)
+                    else:
+                        enemies[kept] = enemy
+                        kept += 1
+                del enemies[kept:]
+
+    def _update_entity_arrays(self):
+        # Same rules as _update_entities, run as batched NumPy operations
+        np = entity_arrays.np
+        bullets = self.bullets
+        enemies = self.enemies
+
+        with profiler.phase("bullets"):
+            # --- Update bullets ---
+            bullets.cull(constants.ENEMY_MIN_Y)
+            bullets.move()
+
+        with profiler.phase("enemies"):
+            # --- Update enemies, prevent merging, handle off-screen ---
+            enemies.move()
+            enemies.separate()
+            alive = enemies.x > -enemies.width
+            off_screen = len(enemies) - int(alive.sum())
+            if off_screen and self.score > 0:
+                # Every enemy that got past costs 10 points, game over when the score hits 0
+                self.score = max(0, self.score - 10 * off_screen)
+                if self.score == 0:
+                    self.game_over = True
+
+        with profiler.phase("collide_beaver"):
+            # --- Collision: Enemy with Beaver ---
+            rect = self.beaver.rect
+            touching = alive & ((enemies.x < rect.right) & (rect.x < enemies.x + enemies.width) &
+                                (enemies.y < rect.bottom) & (rect.y < enemies.y + enemies.height))
+            hits = int(touching.sum())
+            if hits:
+                self.beaver.hp -= 10 * hits # Lose HP on collision
+                alive &= ~touching
                 if self.beaver.hp <= 0:
                     self.game_over = True
 
-        # --- Collision: Bullet with Enemy ---
-        bullets_to_keep = []
-        for bullet in self.bullets:
-            hit_enemy = False
-            for enemy in self.enemies[:]: 
-                if bullet.rect.colliderect(enemy.rect):
-                    self.enemies.remove(enemy) 
-                    self.score += 10 
-                    hit_enemy = True
-                    break 
-            if not hit_enemy:
-                bullets_to_keep.append(bullet) 
-        self.bullets = bullets_to_keep
+        with profiler.phase("collide_bullets"):
+            # --- Collision: Bullet with Enemy ---
+            # Each bullet removes the first (in list order) enemy it touches that is still alive
+            if len(bullets) and alive.any():
+                size = bullets.radius * 2
+                hit_bullets, hit_enemies = entity_arrays.contacts(
+                    bullets.rect_x, bullets.rect_y, size, size, enemies.x, enemies.y, enemies.width, enemies.height)
+                live = alive[hit_enemies]
+                bullet_alive = np.ones(len(bullets), dtype=bool)
+                last = None # Bullet that already hit (pairs come sorted by bullet, then enemy)
+                for b, e in zip(hit_bullets[live].tolist(), hit_enemies[live].tolist()):
+                    if b != last and alive[e]:
+                        alive[e] = False
+                        bullet_alive[b] = False
+                        self.score += 10
+                        last = b
+                bullets.keep(bullet_alive)
 
-    def draw(self, screen):
-        if self.game_over:
-            # Draw end image as background on game over
-            screen.blit(self.end_image, (0, 0))
-        else:
-            screen.fill((255, 255, 255)) # Fill with WHITE from constants
-        self.beaver.draw(screen)
-        for bullet in self.bullets:
-            bullet.draw(screen)
-        for enemy in self.enemies:
-            enemy.draw(screen)
-
-        # --- Draw HUD (Score, HP, Stage, Ammo) ---
-        # HP (top left)
-        hp_text = self.font.render(f"HP: {self.beaver.hp}", True, constants.BLACK)
-        screen.blit(hp_text, (10, 10))
-        # Ammo (top left, below HP)
-        ammo_text = self.font.render(f"Ammo: {self.beaver.current_ammo}/{self.beaver.max_ammo}", True, constants.BLACK)
-        screen.blit(ammo_text, (10, 40))
-        # Stage (centered at top)
-        if self.score < constants.STAGE_ONE_SPEED:
-            stage = 1
-        elif self.score < constants.STAGE_TWO_SPEED:
-            stage = 2
-        else:
-            stage = 3
-        stage_text = self.font.render(f"Stage: {stage}", True, constants.BLACK)
-        stage_text_rect = stage_text.get_rect(center=(constants.WIDTH // 2, 25)) 
-        screen.blit(stage_text, stage_text_rect)
-        # Score (top right)
-        score_text = self.font.render(f"Score: {int(self.score)}", True, constants.BLACK)
-        score_rect = score_text.get_rect(topright=(constants.WIDTH - 10, 10))
-        screen.blit(score_text, score_rect)
-        # Display reloading message below the stage text
-        if self.beaver.reloading:
-            reloading_text = self.reloading_font.render("RELOADING...", True, constants.BLUE)
-            reloading_text_rect = reloading_text.get_rect(center=(constants.WIDTH // 2, stage_text_rect.bottom + 20))
-            screen.blit(reloading_text, reloading_text_rect)
-        # Display Game Over message (large, bold, with shadow and outline)
-        if self.game_over:
-            big_font = pygame.font.SysFont("arial", 56, bold=True)
-            text = "Game Over! Press R to Restart"
-            # Draw shadow
-            shadow = big_font.render(text, True, (0,0,0))
-            shadow_rect = shadow.get_rect(center=(constants.WIDTH // 2, constants.HEIGHT // 2 + 3))
-            screen.blit(shadow, shadow_rect)
-            # Draw outline (white)
-            outline = big_font.render(text, True, (255,255,255))
-            outline_rect = outline.get_rect(center=(constants.WIDTH // 2, constants.HEIGHT // 2 - 3))
-            screen.blit(outline, outline_rect)
-            # Draw main text (red)
-            game_over_text = big_font.render(text, True, constants.RED)
-            game_over_rect = game_over_text.get_rect(center=(constants.WIDTH // 2, constants.HEIGHT // 2))
-            screen.blit(game_over_text, game_over_rect)
+        with profiler.phase("removals"):
+            # Apply all enemy removals at once
+            enemies.keep(alive)
+
+    def pool_stats(self):
+        # Size (objects ever created), free, in-use and high-water mark of each entity pool
+        return {"bullets": self.bullet_pool.stats(), "enemies": self.enemy_pool.stats()}
+
+    def draw(self, screen, alpha=1.0):
+        # alpha: how far between the last two updates to draw moving things (1.0 = latest state)
+        with profiler.phase("background"):
+            if self.game_over:
+                # Draw end image as background on game over
+                screen.blit(self.end_image, (0, 0))
+            else:
+                screen.fill((255, 255, 255)) # Fill with WHITE from constants
+        self.draw_sprites(screen, alpha)
+
+    def draw_sprites(self, screen, alpha=1.0):
+        # Draw everything on top of the background, returns the areas drawn
+        with profiler.phase("sprites"):
+            rects = self.beaver.draw(screen, alpha)
+            if self.backend == "numpy":
+                rects += self.bullets.draw(screen, alpha)
+                rects += self.enemies.draw(screen, alpha)
+            else:
+                for bullet in self.bullets:
+                    rects.append(bullet.draw(screen, alpha))
+                for enemy in self.enemies:
+                    rects.append(enemy.draw(screen, alpha))
+
+        # --- Draw HUD (Score, HP, Stage, Ammo, reloading and game over messages) ---
+        with profiler.phase("hud"):
+            rects += self.hud.draw(screen, self)
+        return rects
 
     def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        with profiler.phase("events"):
+            frame = self.input_source.poll(self)
+            if frame.quit:
                 return False
-            if event.type == pygame.KEYDOWN:
+            self.held_keys = frame.held
+            for key in frame.keydowns:
+                # Profiler overlay (F3) and export (F4)
+                if key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                elif key == pygame.K_F4 and profiler.enabled:
+                    profiler.export()
                 # Handle shooting
-                if event.key == pygame.K_SPACE and not self.game_over:
+                if key == pygame.K_SPACE and not self.game_over:
                     bullet = self.beaver.shoot()
                     if bullet:
                         self.bullets.append(bullet)
+                        if self.backend == "numpy":
+                            self.bullet_pool.release(bullet) # The arrays keep a copy
                     elif self.beaver.current_ammo == 0 and not self.beaver.reloading:
                         self.beaver.reloading = True
-                        self.beaver.reload_timer = pygame.time.get_ticks()
+                        self.beaver.reload_timer = self.clock.get_ticks()
                 # Handle restart and manual reload
-                if event.key == pygame.K_r:
+                if key == pygame.K_r:
                     if self.game_over:
-                        self.__init__()  # Restart game
+                        # Restart game, keeping the loaded assets, backend, clock, input and RNG
+                        self.reset()
                     elif not self.beaver.reloading and self.beaver.current_ammo < self.beaver.max_ammo:
                         self.beaver.reloading = True
-                        self.beaver.reload_timer = pygame.time.get_ticks()
-        return True
\ No newline at end of file
+                        self.beaver.reload_timer = self.clock.get_ticks()
+            return True
\ No newline at end of file
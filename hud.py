@@ -0,0 +1,89 @@
+import pygame
+import constants # Import constants module to access shared variables
+import assets # Shared font cache
+
+class CachedText:
+    # One line of HUD text: the surface is only re-rendered when the text changes
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.text = None
+        self.surface = None
+        self.renders = 0 # How many times font.render actually ran
+
+    def render(self, text):
+        if text != self.text:
+            self.text = text
+            self.surface = self.font.render(text, True, self.color)
+            self.renders += 1
+        return self.surface
+
+def stage_for_score(score):
+    # Stage shown in the HUD (same thresholds as enemy speeds)
+    if score < constants.STAGE_ONE_SPEED:
+        return 1
+    elif score < constants.STAGE_TWO_SPEED:
+        return 2
+    return 3
+
+def build_game_over_overlay(font, text):
+    # Shadow, white outline and red text, rendered once: [(surface, screen rect)] in drawing order.
+    # They are still blitted one by one onto the screen, so the antialiased edges blend exactly
+    # like before. The outline sits 3px above and the shadow 3px below the main text.
+    layers = []
+    for color, offset in (((0, 0, 0), 3), ((255, 255, 255), -3), (constants.RED, 0)):
+        surface = font.render(text, True, color)
+        layers.append((surface, surface.get_rect(center=(constants.WIDTH // 2, constants.HEIGHT // 2 + offset))))
+    return layers
+
+def draw_loading_screen(screen, font, progress):
+    # Startup screen shown while assets load: text and a progress bar (progress 0 to 1)
+    screen.fill(constants.WHITE)
+    text = font.render(f"Loading... {int(progress * 100)}%", True, constants.BLACK)
+    center_x, center_y = constants.WIDTH // 2, constants.HEIGHT // 2
+    screen.blit(text, text.get_rect(center=(center_x, center_y - 30)))
+    bar = pygame.Rect(0, 0, constants.WIDTH // 3, 20)
+    bar.center = (center_x, center_y + 10)
+    pygame.draw.rect(screen, constants.BLACK, bar, 2)
+    filled = bar.inflate(-8, -8)
+    filled.width = int(filled.width * progress)
+    pygame.draw.rect(screen, constants.BLUE, filled)
+
+class Hud:
+    def __init__(self, font, reloading_font):
+        self.hp_text = CachedText(font, constants.BLACK)
+        self.ammo_text = CachedText(font, constants.BLACK)
+        self.stage_text = CachedText(font, constants.BLACK)
+        self.score_text = CachedText(font, constants.BLACK)
+        # Static texts are rendered once
+        self.reloading_text = reloading_font.render("RELOADING...", True, constants.BLUE)
+        big_font = assets.load_font("arial", 56, bold=True)
+        self.game_over_overlay = build_game_over_overlay(big_font, "Game Over! Press R to Restart")
+
+    def draw(self, screen, game):
+        # Returns the areas drawn (for dirty-rect rendering)
+        beaver = game.beaver
+        rects = []
+        # HP (top left)
+        rects.append(screen.blit(self.hp_text.render(f"HP: {beaver.hp}"), (10, 10)))
+        # Ammo (top left, below HP)
+        rects.append(screen.blit(self.ammo_text.render(f"Ammo: {beaver.current_ammo}/{beaver.max_ammo}"), (10, 40)))
+        # Stage (centered at top)
+        if game.waves is not None:
+            stage_text = self.stage_text.render(f"Wave: {game.waves.wave.name}")
+        else:
+            stage_text = self.stage_text.render(f"Stage: {stage_for_score(game.score)}")
+        stage_text_rect = stage_text.get_rect(center=(constants.WIDTH // 2, 25))
+        rects.append(screen.blit(stage_text, stage_text_rect))
+        # Score (top right)
+        score_text = self.score_text.render(f"Score: {int(game.score)}")
+        rects.append(screen.blit(score_text, score_text.get_rect(topright=(constants.WIDTH - 10, 10))))
+        # Display reloading message below the stage text
+        if beaver.reloading:
+            reloading_rect = self.reloading_text.get_rect(center=(constants.WIDTH // 2, stage_text_rect.bottom + 20))
+            rects.append(screen.blit(self.reloading_text, reloading_rect))
+        # Display Game Over message (large, bold, with shadow and outline)
+        if game.game_over:
+            for surface, rect in self.game_over_overlay:
+                rects.append(screen.blit(surface, rect))
+        return rects
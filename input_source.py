@@ -0,0 +1,43 @@
+import pygame
+
+# Input sources turn whatever drives the beaver (keyboard, a script, a bot) into one
+# InputFrame per frame, so GameManager never has to read pygame's event queue directly.
+
+class HeldKeys:
+    # Key state that can be indexed like pygame.key.get_pressed(): keys[pygame.K_UP]
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+class InputFrame:
+    # Everything the game needs from the player for one frame
+    def __init__(self, keydowns=(), held=None, quit=False):
+        self.keydowns = tuple(keydowns) # Keys pressed this frame, in order (pygame key codes)
+        self.held = held if held is not None else HeldKeys() # Keys held down right now
+        self.quit = quit # Window closed
+
+# Frame with no input at all
+NO_INPUT = InputFrame()
+
+class KeyboardInput:
+    # Live input from pygame's event queue and keyboard state
+    def poll(self, game):
+        keydowns = []
+        quit = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit = True
+            elif event.type == pygame.KEYDOWN:
+                keydowns.append(event.key)
+        return InputFrame(keydowns, pygame.key.get_pressed(), quit)
+
+class ScriptedInput:
+    # Input decided by a policy: a function taking the GameManager and returning an InputFrame
+    def __init__(self, policy):
+        self.policy = policy
+
+    def poll(self, game):
+        frame = self.policy(game)
+        return frame if frame is not None else NO_INPUT
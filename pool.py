@@ -0,0 +1,47 @@
+# Object pool: keeps released objects around so they can be reused instead of allocated.
+# Pooled classes implement reset(*args), which puts a recycled object into the same state
+# a freshly constructed one would have.
+
+class ObjectPool:
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = [] # Released objects waiting to be reused
+        self.created = 0 # Objects ever constructed by this pool
+        self.in_use = 0 # Objects handed out and not released yet
+        self.high_water = 0 # Most objects in use at the same time
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def release_all(self, objects):
+        # Release every object in a list and empty it
+        self.in_use -= len(objects)
+        self.free.extend(objects)
+        objects.clear()
+
+    def reserve(self, count, *args):
+        # Construct objects up front (e.g. at startup) so the pool has at least count free ones
+        while len(self.free) < count:
+            self.free.append(self.cls(*args))
+            self.created += 1
+
+    def stats(self):
+        return {
+            "size": self.created,
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+        }
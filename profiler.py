@@ -0,0 +1,168 @@
+import csv
+import json
+import time
+from collections import deque
+import pygame
+
+# Per-phase frame timing.
+# Code marks phases with `with profiler.phase("name"):`. While the profiler is disabled
+# (the default) phase() hands back one shared do-nothing context manager, so the
+# instrumentation can stay in release builds. When enabled, every phase keeps its latest
+# WINDOW timings so rolling percentiles (p50/p95/p99) can be shown on an overlay (F3) or
+# exported as CSV/JSON (F4).
+
+WINDOW = 600 # Samples kept per phase (10 seconds at 60 FPS)
+OVERLAY_REFRESH_FRAMES = 15 # Re-render the overlay text every N frames
+
+class _NullPhase:
+    # Used while disabled: entering/leaving costs two empty method calls
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.samples.append((time.perf_counter() - self.start) * 1000)
+        return False
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class Profiler:
+    def __init__(self, window=WINDOW):
+        self.enabled = False
+        self.overlay_visible = False
+        self.window = window
+        self.phases = {} # name -> _Phase (in first-seen order)
+        self.counts = {} # name -> deque of per-frame entity counts
+        self.overlay = None # Cached overlay surface
+        self.overlay_age = 0
+        self.font = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.overlay_visible = False
+
+    def toggle_overlay(self):
+        # Overlay on = profiling on; off again stops collecting
+        self.overlay_visible = not self.overlay_visible
+        self.enabled = self.overlay_visible
+
+    def reset(self):
+        self.phases.clear()
+        self.counts.clear()
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase(deque(maxlen=self.window))
+        return phase
+
+    def record_counts(self, **counts):
+        # Entity counts for the current frame, e.g. record_counts(bullets=3, enemies=12)
+        if not self.enabled:
+            return
+        for name, value in counts.items():
+            samples = self.counts.get(name)
+            if samples is None:
+                samples = self.counts[name] = deque(maxlen=self.window)
+            samples.append(value)
+
+    def summary(self):
+        # {"phases": {name: {"p50", "p95", "p99", "mean", "max", "samples"}}, "counts": {name: {...}}}
+        phases = {}
+        for name, phase in self.phases.items():
+            values = sorted(phase.samples)
+            phases[name] = {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "mean": sum(values) / len(values) if values else 0.0,
+                "max": values[-1] if values else 0.0,
+                "samples": len(values),
+            }
+        counts = {}
+        for name, samples in self.counts.items():
+            values = sorted(samples)
+            counts[name] = {
+                "p50": percentile(values, 50),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else 0,
+                "last": samples[-1] if samples else 0,
+            }
+        return {"phases": phases, "counts": counts}
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_csv(self, path):
+        # One row per phase (times in ms)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms", "samples"])
+            for name, stats in self.summary()["phases"].items():
+                writer.writerow([name, f"{stats['p50']:.4f}", f"{stats['p95']:.4f}", f"{stats['p99']:.4f}",
+                                 f"{stats['mean']:.4f}", f"{stats['max']:.4f}", stats["samples"]])
+
+    def export(self, basename="profile"):
+        # Write <basename>.json and <basename>.csv, returns the paths
+        self.export_json(basename + ".json")
+        self.export_csv(basename + ".csv")
+        return basename + ".json", basename + ".csv"
+
+    def _build_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("consolas,couriernew,monospace", 14)
+        summary = self.summary()
+        rows = [["phase (ms)", "p50", "p95", "p99"]]
+        for name, stats in summary["phases"].items():
+            rows.append([name, f"{stats['p50']:.3f}", f"{stats['p95']:.3f}", f"{stats['p99']:.3f}"])
+        for name, stats in summary["counts"].items():
+            rows.append([name, str(stats["last"]), "max", str(stats["max"])])
+        # Render cell by cell so columns line up with any font
+        cells = [[self.font.render(text, True, (255, 255, 255)) for text in row] for row in rows]
+        widths = [max(row[col].get_width() for row in cells) + 12 for col in range(len(rows[0]))]
+        line_height = self.font.get_linesize()
+        overlay = pygame.Surface((sum(widths) + 12, line_height * len(cells) + 12), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        for i, row in enumerate(cells):
+            x = 6
+            for col, surface in enumerate(row):
+                # Names left aligned, numbers right aligned
+                offset = 0 if col == 0 else widths[col] - 12 - surface.get_width()
+                overlay.blit(surface, (x + offset, 6 + i * line_height))
+                x += widths[col]
+        return overlay
+
+    def draw_overlay(self, screen, position=(10, 80)):
+        # Draws the stats table (if visible) and returns the area drawn, or None
+        if not self.overlay_visible:
+            return None
+        self.overlay_age += 1
+        if self.overlay is None or self.overlay_age >= OVERLAY_REFRESH_FRAMES:
+            self.overlay = self._build_overlay()
+            self.overlay_age = 0
+        return screen.blit(self.overlay, position)
+
+# Shared instance used by the game
+profiler = Profiler()
@@ -0,0 +1,46 @@
+import pygame
+import constants # Import constants module to access shared variables
+
+# Dirty-rectangle rendering: instead of clearing and flipping the whole window every frame,
+# only the areas covered by sprites (this frame and last frame) are restored from a cached
+# background, redrawn and pushed with pygame.display.update(rects).
+
+# Above this share of the screen, one full update is cheaper than many small ones
+FULL_UPDATE_RATIO = 0.5
+
+class DirtyRectRenderer:
+    def __init__(self):
+        # Plain white background, built once
+        self.white = pygame.Surface((constants.WIDTH, constants.HEIGHT)).convert()
+        self.white.fill(constants.WHITE)
+        self.background = None # Background currently on screen
+        self.previous = []     # Areas drawn last frame
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        # Force a full redraw next frame (e.g. after something else drew on the screen)
+        self.background = None
+
+    def render(self, screen, game, alpha=1.0):
+        # Draw the frame and return the list of rects to pass to pygame.display.update
+        background = game.end_image if game.game_over else self.white
+        if background is not self.background:
+            # Background changed (start, game over, restart): redraw everything once
+            self.background = background
+            screen.blit(background, (0, 0))
+            self.previous = game.draw_sprites(screen, alpha)
+            self.full_updates += 1
+            return [screen.get_rect()]
+        # Erase last frame's sprites by restoring the background under them
+        for rect in self.previous:
+            screen.blit(background, rect, rect)
+        drawn = game.draw_sprites(screen, alpha)
+        dirty = self.previous + drawn
+        self.previous = drawn
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > FULL_UPDATE_RATIO * constants.WIDTH * constants.HEIGHT:
+            self.full_updates += 1
+            return [screen.get_rect()]
+        self.partial_updates += 1
+        return dirty
@@ -0,0 +1,366 @@
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import time
+
+import pygame
+import assets
+import constants
+import entity_arrays
+from game_manager import GameManager
+from game_clock import ReplayClock
+from input_source import InputFrame, HeldKeys
+from profiler import profiler
+
+# Input recording and replay.
+#
+# A recording holds everything needed to play a session again exactly: the RNG seed, and
+# for every frame the clock time, the held movement/aim keys, the game keys pressed and how
+# long the frame took. Every SNAPSHOT_INTERVAL frames the whole game state (beaver, bullets,
+# enemies, score, ammo, RNG state) is stored too, so a replay can jump close to any frame
+# and fast-forward from there instead of replaying from the start.
+# Constants (including WAVE_CONFIG) are not recorded: replay with the same settings.
+#
+# File layout (little endian):
+#   header   b"BVRP", version u16, seed u64, snapshot interval u32
+#   frame    b"F", ticks u32, cost_us u32, held bits u8, n u8, n key codes u32
+#   snapshot b"S", frame index u32, size u32, state (see capture_state)
+#
+# Recording from the game (the game must use a FrameClock and a seeded random.Random):
+#   recorder = Recorder("session.bvr", seed)
+#   game = GameManager(clock=clock, input_source=RecordingInput(KeyboardInput(), recorder), rng=random.Random(seed))
+#   ... after every game.update(): recorder.end_frame()
+#
+# Replaying: python replay.py session.bvr [--speed 4] [--seek 5000] [--profile] [--spikes 3]
+
+MAGIC = b"BVRP"
+VERSION = 1
+SNAPSHOT_INTERVAL = 600 # Frames between state snapshots (10 seconds at 60 FPS)
+
+HEADER = struct.Struct("<4sHQI")
+FRAME = struct.Struct("<IIBB")
+SNAPSHOT = struct.Struct("<II")
+
+# Held keys that matter to the game, one bit each
+HELD_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_w, pygame.K_s)
+# Key presses that matter to the game (profiler keys etc. are not recorded)
+GAME_KEYS = (pygame.K_SPACE, pygame.K_r)
+
+# --- Game state snapshots ---
+
+GAME_STATE = struct.Struct("<iBIIB")          # score, game over, spawn counter, spawn interval, scream played
+BEAVER_STATE = struct.Struct("<dddiiiBqqdd")   # y, prev y, angle, hp, ammo, max ammo, reloading, reload timer, last shot, gun tip
+RNG_STATE = struct.Struct("<i625IBd")          # version, Mersenne Twister state, has gauss_next, gauss_next
+BULLET_STATE = struct.Struct("<6d2i")          # x, y, dx, dy, prev x, prev y, rect x, rect y
+ENEMY_STATE = struct.Struct("<9i")             # x, y, prev x, prev y, speed, min y, max y, width, height
+WAVE_STATE = struct.Struct("<IIII")           # wave, frame in wave, loops, pending spawns (wave mode only)
+COUNT = struct.Struct("<I")
+
+def _number(value):
+    # Keep whole numbers as ints (positions and angles are ints in the game)
+    return int(value) if float(value).is_integer() else value
+
+def capture_state(game):
+    # Serialize the full game state to bytes (either entity backend)
+    beaver = game.beaver
+    version, mt, gauss = game.rng.getstate()
+    parts = [
+        GAME_STATE.pack(game.score, game.game_over, game.spawn_counter, game.spawn_interval, game.scream_played),
+        BEAVER_STATE.pack(beaver.y, beaver.prev_y, beaver.angle, beaver.hp, beaver.current_ammo, beaver.max_ammo,
+                          beaver.reloading, beaver.reload_timer, beaver.last_shot_time, *beaver.gun_tip),
+        RNG_STATE.pack(version, *mt, gauss is not None, gauss or 0.0),
+    ]
+    bullets = game.bullets
+    enemies = game.enemies
+    if game.backend == "numpy":
+        bullet_rows = zip(bullets.x.tolist(), bullets.y.tolist(), bullets.vx.tolist(), bullets.vy.tolist(),
+                          bullets.prev_x.tolist(), bullets.prev_y.tolist(), bullets.rect_x.tolist(), bullets.rect_y.tolist())
+        enemy_rows = zip(enemies.x.tolist(), enemies.y.tolist(), enemies.prev_x.tolist(), enemies.prev_y.tolist(),
+                         enemies.speed.tolist(), enemies.min_y.tolist(), enemies.max_y.tolist(),
+                         enemies.width.tolist(), enemies.height.tolist())
+    else:
+        bullet_rows = [(b.x, b.y, b.dx, b.dy, b.prev_x, b.prev_y, b.rect.x, b.rect.y) for b in bullets]
+        enemy_rows = [(e.x, e.y, e.prev_x, e.prev_y, e.speed, e.min_y, e.max_y, e.width, e.height) for e in enemies]
+    parts.append(COUNT.pack(len(bullets)))
+    parts.extend(BULLET_STATE.pack(*row) for row in bullet_rows)
+    parts.append(COUNT.pack(len(enemies)))
+    parts.extend(ENEMY_STATE.pack(*row) for row in enemy_rows)
+    waves = game.waves
+    if waves is not None:
+        parts.append(WAVE_STATE.pack(waves.index, waves.frame, waves.loops, waves.pending))
+    return b"".join(parts)
+
+def restore_state(game, data):
+    # Load a capture_state() snapshot into an existing GameManager
+    offset = 0
+    def read(layout):
+        nonlocal offset
+        values = layout.unpack_from(data, offset)
+        offset += layout.size
+        return values
+    (game.score, game_over, game.spawn_counter, game.spawn_interval, scream_played) = read(GAME_STATE)
+    game.game_over = bool(game_over)
+    game.scream_played = bool(scream_played)
+    beaver = game.beaver
+    (y, prev_y, angle, beaver.hp, beaver.current_ammo, beaver.max_ammo, reloading,
+     beaver.reload_timer, beaver.last_shot_time, tip_x, tip_y) = read(BEAVER_STATE)
+    beaver.y = _number(y)
+    beaver.prev_y = _number(prev_y)
+    beaver.angle = _number(angle)
+    beaver.reloading = bool(reloading)
+    beaver.gun_tip = (tip_x, tip_y)
+    beaver.rect.y = beaver.y
+    rng = read(RNG_STATE)
+    game.rng.setstate((rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None))
+
+    bullet_rows = [read(BULLET_STATE) for _ in range(read(COUNT)[0])]
+    enemy_rows = [read(ENEMY_STATE) for _ in range(read(COUNT)[0])]
+    if game.waves is not None:
+        waves = game.waves
+        waves.index, waves.frame, waves.loops, waves.pending = read(WAVE_STATE)
+    if game.backend == "numpy":
+        np = entity_arrays.np
+        bullets = game.bullets
+        columns = list(zip(*bullet_rows)) or [()] * 8
+        bullets.x, bullets.y, bullets.vx, bullets.vy, bullets.prev_x, bullets.prev_y = (
+            np.array(column, dtype=float) for column in columns[:6])
+        bullets.rect_x, bullets.rect_y = (np.array(column, dtype=np.int64) for column in columns[6:])
+        enemies = game.enemies
+        columns = list(zip(*enemy_rows)) or [()] * 9
+        (enemies.x, enemies.y, enemies.prev_x, enemies.prev_y, enemies.speed, enemies.min_y, enemies.max_y,
+         enemies.width, enemies.height) = (np.array(column, dtype=np.int64) for column in columns)
+        if enemies.image is None:
+            enemies.image = assets.load_image("images/vidra.png", (100, 80))
+        return
+    game.bullet_pool.release_all(game.bullets)
+    for x, y, dx, dy, prev_x, prev_y, rect_x, rect_y in bullet_rows:
+        bullet = game.bullet_pool.acquire(x, y, 0) # Direction overwritten below
+        bullet.dx, bullet.dy, bullet.prev_x, bullet.prev_y = dx, dy, prev_x, prev_y
+        bullet.rect.x, bullet.rect.y = rect_x, rect_y
+        game.bullets.append(bullet)
+    game.enemy_pool.release_all(game.enemies)
+    for x, y, prev_x, prev_y, speed, min_y, max_y, _, _ in enemy_rows:
+        enemy = game.enemy_pool.acquire(game.score, random.Random(0)) # Fields overwritten below
+        enemy.x, enemy.y, enemy.prev_x, enemy.prev_y = x, y, prev_x, prev_y
+        enemy.speed, enemy.min_y, enemy.max_y = speed, min_y, max_y
+        enemy.rect.x, enemy.rect.y = x, y
+        game.enemies.append(enemy)
+
+# --- Recording ---
+
+def held_bits(held):
+    bits = 0
+    for bit, key in enumerate(HELD_KEYS):
+        if held[key]:
+            bits |= 1 << bit
+    return bits
+
+class Recorder:
+    def __init__(self, path, seed, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, snapshot_interval))
+        self.snapshot_interval = snapshot_interval
+        self.frames = 0
+        self.pending = None # (ticks, held bits, keys) of the frame in progress
+        self.frame_start = 0.0
+
+    def begin_frame(self, game, frame):
+        # Called before the frame changes anything: snapshot if due, then remember its input
+        if self.frames % self.snapshot_interval == 0:
+            state = capture_state(game)
+            self.file.write(b"S" + SNAPSHOT.pack(self.frames, len(state)) + state)
+        keys = [key for key in frame.keydowns if key in GAME_KEYS]
+        self.pending = (game.clock.get_ticks(), held_bits(frame.held), keys)
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        # Called after game.update(): writes the frame with the time it took
+        if self.pending is None:
+            return
+        ticks, bits, keys = self.pending
+        cost_us = min(int((time.perf_counter() - self.frame_start) * 1e6), 0xFFFFFFFF)
+        self.file.write(b"F" + FRAME.pack(ticks, cost_us, bits, len(keys)))
+        if keys:
+            self.file.write(struct.pack(f"<{len(keys)}I", *keys))
+        self.pending = None
+        self.frames += 1
+
+    def close(self):
+        self.pending = None
+        self.file.close()
+
+class RecordingInput:
+    # Wraps another input source and records what it returns
+    def __init__(self, source, recorder):
+        self.source = source
+        self.recorder = recorder
+
+    def poll(self, game):
+        frame = self.source.poll(game)
+        if not frame.quit:
+            self.recorder.begin_frame(game, frame)
+        return frame
+
+# --- Replaying ---
+
+class Replay:
+    # A recording loaded into memory
+    def __init__(self, seed, snapshot_interval, frames, snapshots):
+        self.seed = seed
+        self.snapshot_interval = snapshot_interval
+        self.frames = frames # [(ticks, cost_us, held bits, keys)]
+        self.snapshots = snapshots # frame index -> state bytes
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, interval = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        offset = HEADER.size
+        frames = []
+        snapshots = {}
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            offset += 1
+            if tag == b"F":
+                ticks, cost_us, bits, count = FRAME.unpack_from(data, offset)
+                offset += FRAME.size
+                keys = struct.unpack_from(f"<{count}I", data, offset) if count else ()
+                offset += 4 * count
+                frames.append((ticks, cost_us, bits, keys))
+            elif tag == b"S":
+                index, size = SNAPSHOT.unpack_from(data, offset)
+                offset += SNAPSHOT.size
+                snapshots[index] = data[offset:offset + size]
+                offset += size
+            else:
+                raise ValueError(f"Corrupt replay {path} at byte {offset - 1}")
+        return cls(seed, interval, frames, snapshots)
+
+    def slowest(self, count=5):
+        # Indices of the frames that took longest when recorded
+        order = sorted(range(len(self.frames)), key=lambda index: self.frames[index][1], reverse=True)
+        return order[:count]
+
+class _ReplayInput:
+    def __init__(self, replayer):
+        self.replayer = replayer
+
+    def poll(self, game):
+        return self.replayer.current_input
+
+class Replayer:
+    def __init__(self, replay, backend=None):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.replay = replay
+        self.clock = ReplayClock()
+        self.current_input = InputFrame()
+        self.game = GameManager(backend, self.clock, _ReplayInput(self), random.Random(replay.seed))
+        self.frame = 0 # Next frame to play
+        self.mismatches = [] # Snapshot frames where the replayed state differed (verify mode)
+
+    def step(self, verify=False):
+        replay = self.replay
+        if verify and self.frame in replay.snapshots and capture_state(self.game) != replay.snapshots[self.frame]:
+            self.mismatches.append(self.frame)
+        ticks, _, bits, keys = replay.frames[self.frame]
+        self.clock.time_ms = ticks
+        held = [key for bit, key in enumerate(HELD_KEYS) if bits & (1 << bit)]
+        self.current_input = InputFrame(keys, HeldKeys(held))
+        self.game.handle_events()
+        self.game.update()
+        self.frame += 1
+
+    def seek(self, frame):
+        # Jump to the start of a frame: restore the nearest snapshot at or before it, then fast-forward
+        frame = max(0, min(frame, len(self.replay.frames)))
+        start = max((index for index in self.replay.snapshots if index <= frame), default=None)
+        if start is not None and (frame < self.frame or start > self.frame):
+            restore_state(self.game, self.replay.snapshots[start])
+            self.frame = start
+        elif frame < self.frame:
+            raise ValueError("No snapshot to seek back to")
+        while self.frame < frame:
+            self.step()
+
+    async def play(self, until=None, speed=None, screen=None, verify=False):
+        # Replay up to frame `until` (default: the end).
+        # speed None: as fast as possible; otherwise recorded time is scaled by 1/speed.
+        # screen: draw every frame to it (and flip) when given.
+        until = len(self.replay.frames) if until is None else min(until, len(self.replay.frames))
+        frames = self.replay.frames
+        start_time = time.perf_counter()
+        start_ticks = frames[self.frame][0] if self.frame < until else 0
+        while self.frame < until:
+            self.step(verify)
+            if screen is not None:
+                self.game.draw(screen)
+                pygame.display.flip()
+                pygame.event.pump()
+            if speed is not None and self.frame < until:
+                target = (frames[self.frame][0] - start_ticks) / 1000 / speed
+                delay = target - (time.perf_counter() - start_time)
+                await asyncio.sleep(max(0.0, delay))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session")
+    parser.add_argument("path")
+    parser.add_argument("--seek", type=int, default=0, help="start at this frame")
+    parser.add_argument("--until", type=int, default=None, help="stop before this frame")
+    parser.add_argument("--speed", type=float, default=None, help="1 = real time, 4 = 4x (default: as fast as possible)")
+    parser.add_argument("--show", action="store_true", help="draw the replay in a window")
+    parser.add_argument("--backend", default=None, help="entity backend (objects or numpy)")
+    parser.add_argument("--profile", action="store_true", help="print per-phase timings")
+    parser.add_argument("--verify", action="store_true", help="check the replayed state against every snapshot")
+    parser.add_argument("--spikes", type=int, default=0, help="profile the N slowest recorded frames")
+    args = parser.parse_args(argv)
+
+    screen = None
+    if args.show:
+        pygame.init()
+        screen = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
+        assets.preload()
+    else:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        assets.set_headless(True)
+
+    replay = Replay.load(args.path)
+    replayer = Replayer(replay, args.backend)
+    print(f"{len(replay.frames)} frames, {len(replay.snapshots)} snapshots, seed {replay.seed}")
+
+    if args.spikes:
+        # Replay each slow frame (plus a few before it) under the profiler
+        for index in replay.slowest(args.spikes):
+            replayer.seek(max(0, index - 5))
+            profiler.reset()
+            profiler.set_enabled(True)
+            while replayer.frame <= index:
+                replayer.step()
+            profiler.set_enabled(False)
+            print(f"frame {index}: recorded {replay.frames[index][1] / 1000:.3f} ms")
+            for name, stats in profiler.summary()["phases"].items():
+                print(f"  {name:<16} max {stats['max']:.3f} ms")
+        return
+
+    replayer.seek(args.seek)
+    profiler.set_enabled(args.profile)
+    start = time.perf_counter()
+    asyncio.run(replayer.play(args.until, args.speed, screen, args.verify))
+    elapsed = time.perf_counter() - start
+    game = replayer.game
+    print(f"replayed to frame {replayer.frame} in {elapsed:.2f}s: score {game.score}, hp {game.beaver.hp}, "
+          f"ammo {game.beaver.current_ammo}, game over {game.game_over}")
+    if args.verify:
+        print("state matches every snapshot" if not replayer.mismatches else f"DESYNC at frames {replayer.mismatches}")
+    if args.profile:
+        for name, stats in profiler.summary()["phases"].items():
+            print(f"  {name:<16} p50 {stats['p50']:.3f}  p99 {stats['p99']:.3f}  max {stats['max']:.3f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import pygame
+import math
+from collections import OrderedDict
+
+class RotationCache:
+    def __init__(self, image, tip_length, angles=range(-90, 91, 5), lru_size=32):
+        # image: unrotated sprite, rotated around its center
+        # tip_length: distance from the pivot (sprite center-left) to the tip along the barrel
+        self.image = image
+        self.tip_length = tip_length
+        self.lru_size = lru_size # Max number of free-form angles kept besides the fixed ones
+        self.fixed = {} # Prebuilt entries for every angle Beaver.update can produce
+        self.lru = OrderedDict() # Fallback for any other angle, least recently used evicted first
+        self.hits = 0
+        self.misses = 0
+        for angle in angles:
+            self.fixed[angle] = self._build(angle)
+
+    def _build(self, angle):
+        # Returns (rotated surface, topleft offset from pivot, gun tip offset from pivot)
+        rotated = pygame.transform.rotate(self.image, angle)
+        # Same placement as rotated.get_rect(center=pivot)
+        topleft = (-(rotated.get_width() // 2), -(rotated.get_height() // 2))
+        rad = math.radians(-angle)
+        tip = (self.tip_length * math.cos(rad), self.tip_length * math.sin(rad))
+        return rotated, topleft, tip
+
+    def get(self, angle):
+        entry = self.fixed.get(angle)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        entry = self.lru.get(angle)
+        if entry is not None:
+            self.hits += 1
+            self.lru.move_to_end(angle)
+            return entry
+        # Free-form angle: rotate now and remember it
+        self.misses += 1
+        entry = self._build(angle)
+        self.lru[angle] = entry
+        if len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+        return entry
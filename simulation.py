@@ -0,0 +1,129 @@
+import os
+import math
+import random
+import time
+
+# Run without a window or sound card (must be set before pygame opens anything)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import assets
+from game_manager import GameManager
+from game_clock import FixedClock
+from input_source import ScriptedInput, InputFrame, HeldKeys, NO_INPUT
+from profiler import percentile
+
+# Headless, deterministic simulation of the game.
+# Time comes from a FixedClock (one fixed step per frame), input from a policy and
+# randomness from a seeded random.Random, so the same seed and policy always play out
+# the same game. Nothing is drawn and no sound is played; frames run as fast as the CPU allows.
+#
+#   sim = HeadlessSimulation(seed=42, policy=my_policy)
+#   result = sim.run(max_frames=36000)
+
+STEP_MS = 1000 / 60 # One frame at 60 FPS
+
+def idle_policy(game):
+    # Never touches the controls
+    return NO_INPUT
+
+def fire_policy(game):
+    # Stands still and holds the trigger (the beaver's own shot delay limits the rate)
+    return InputFrame(keydowns=(pygame.K_SPACE,))
+
+def enemy_boxes(game):
+    # (x, y, width, height) of every enemy, for either entity backend
+    enemies = game.enemies
+    if game.backend == "numpy":
+        return list(zip(enemies.x.tolist(), enemies.y.tolist(), enemies.width.tolist(), enemies.height.tolist()))
+    return [(enemy.x, enemy.y, enemy.width, enemy.height) for enemy in enemies]
+
+def aim_policy(game):
+    # Simple bot: follows the closest otter, turns the gun towards it and keeps firing
+    beaver = game.beaver
+    targets = [box for box in enemy_boxes(game) if box[0] + box[2] > beaver.x + beaver.width]
+    if not targets:
+        return NO_INPUT
+    x, y, width, height = min(targets)
+    target_x = x + width / 2
+    target_y = y + height / 2
+    held = []
+    # Move towards the target's row
+    beaver_center = beaver.y + beaver.height / 2
+    if target_y < beaver_center - beaver.speed:
+        held.append(pygame.K_w)
+    elif target_y > beaver_center + beaver.speed:
+        held.append(pygame.K_s)
+    # Turn the gun (angle > 0 aims up) in 5 degree steps
+    tip_x, tip_y = beaver.gun_tip
+    wanted = math.degrees(math.atan2(tip_y - target_y, max(1.0, target_x - tip_x)))
+    if wanted > beaver.angle + 2.5:
+        held.append(pygame.K_UP)
+    elif wanted < beaver.angle - 2.5:
+        held.append(pygame.K_DOWN)
+    return InputFrame(keydowns=(pygame.K_SPACE,), held=HeldKeys(held))
+
+# Policies by name (used by batch_sim.py)
+POLICIES = {
+    "idle": idle_policy,
+    "fire": fire_policy,
+    "aim": aim_policy,
+}
+
+class HeadlessSimulation:
+    def __init__(self, seed=0, policy=idle_policy, backend=None, step_ms=STEP_MS):
+        # Only the font module is needed (GameManager measures the HUD); no display, no mixer
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if not assets.headless:
+            assets.set_headless(True)
+        self.seed = seed
+        self.clock = FixedClock(step_ms)
+        self.rng = random.Random(seed)
+        self.input = ScriptedInput(policy)
+        self.game = GameManager(backend, self.clock, self.input, self.rng)
+        self.frames = 0 # Frames simulated so far
+
+    def step(self):
+        # Advance one fixed timestep; returns False if the policy asked to quit
+        self.clock.tick()
+        self.frames += 1
+        if not self.game.handle_events():
+            return False
+        self.game.update()
+        return True
+
+    def run(self, max_frames=60 * 60 * 10, stop_on_game_over=True):
+        # Simulate until game over, quit or max_frames; returns a summary of the game
+        game = self.game
+        timer = time.perf_counter
+        frame_ms = [] # Cost of every simulated frame
+        start = timer()
+        while self.frames < max_frames:
+            if stop_on_game_over and game.game_over:
+                break
+            frame_start = timer()
+            running = self.step()
+            frame_ms.append((timer() - frame_start) * 1000)
+            if not running:
+                break
+        elapsed = timer() - start
+        frame_ms.sort()
+        return {
+            "seed": self.seed,
+            "frames": self.frames,
+            "survival_ms": self.clock.get_ticks(),
+            "score": game.score,
+            "hp": game.beaver.hp,
+            "game_over": game.game_over,
+            "wall_time_s": elapsed,
+            "frame_ms_p50": percentile(frame_ms, 50),
+            "frame_ms_p99": percentile(frame_ms, 99),
+            "frame_ms_max": frame_ms[-1] if frame_ms else 0.0,
+        }
+
+if __name__ == "__main__":
+    # Quick check: a few seeded games with the aiming bot
+    for seed in range(5):
+        print(HeadlessSimulation(seed, aim_policy).run())
@@ -0,0 +1,280 @@
+import argparse
+import json
+import socket
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+# Live telemetry: a compact binary frame of the game state after every update, sent as one
+# UDP datagram to a local listener (another process: a viewer, a recorder, an analysis tool).
+# Sending never blocks the game: when the socket can't take a frame it is dropped.
+#
+# Frame layout (little endian):
+#   header  b"BT", version u8, flags u8 (1 = keyframe), sequence u32, clock ms u32,
+#           score i32, events u8, beaver y i16, gun angle i16, hp i32, ammo u16, max ammo u16,
+#           reloading u8, bullet count u16, enemy count u16
+#   body    zlib-compressed int16 array: bullet x, bullet y, enemy x, enemy y (in list order)
+#
+# Keyframes hold absolute positions. Other frames hold, for every entity that also had an index
+# in the previous frame's list, the difference from the previous frame's value at that index
+# (enemies mostly just move by -speed, so the differences compress to almost nothing). A
+# listener that misses a frame waits for the next keyframe: one is sent every
+# KEYFRAME_INTERVAL frames and right after a dropped frame.
+#
+#   constants.TELEMETRY_ADDRESS = ("127.0.0.1", 47800)   # publish from the game
+#   python telemetry.py --show                           # watch it
+#   python telemetry.py --record session.jsonl           # record the decoded frames
+
+VERSION = 1
+DEFAULT_PORT = 47800
+KEYFRAME_INTERVAL = 60
+HEADER = struct.Struct("<2sBBIIiBhhiHHBHH")
+KEYFRAME = 1
+
+# Event bits, derived from what changed since the previous frame
+EVENT_SHOT = 1        # Ammo went down
+EVENT_RELOAD = 2      # Reload started
+EVENT_BEAVER_HIT = 4  # HP went down
+EVENT_KILL = 8        # Score went up
+EVENT_ESCAPE = 16     # Score went down (an otter got past)
+EVENT_GAME_OVER = 32
+EVENT_RESTART = 64
+EVENT_NAMES = {EVENT_SHOT: "shot", EVENT_RELOAD: "reload", EVENT_BEAVER_HIT: "beaver_hit", EVENT_KILL: "kill",
+               EVENT_ESCAPE: "escape", EVENT_GAME_OVER: "game_over", EVENT_RESTART: "restart"}
+
+def _clamp(values):
+    # Half the int16 range, so differences between two positions still fit in an int16
+    # (entities only stray a little off screen before being removed)
+    if not values or (min(values) >= -16384 and max(values) <= 16383):
+        return values
+    return [-16384 if value < -16384 else 16383 if value > 16383 else value for value in values]
+
+def _positions(game):
+    # Bullet and enemy positions as ints (either entity backend)
+    bullets = game.bullets
+    enemies = game.enemies
+    if game.backend == "numpy":
+        positions = (bullets.x.astype(int).tolist(), bullets.y.astype(int).tolist(),
+                     enemies.x.tolist(), enemies.y.tolist())
+    else:
+        positions = ([int(b.x) for b in bullets], [int(b.y) for b in bullets],
+                     [e.x for e in enemies], [e.y for e in enemies])
+    return [_clamp(values) for values in positions]
+
+def _delta(current, previous):
+    # Difference from the previous value at the same index, absolute values past its end
+    shared = min(len(current), len(previous))
+    return [a - b for a, b in zip(current, previous)] + current[shared:]
+
+def _undelta(delta, previous):
+    shared = min(len(delta), len(previous))
+    return [a + b for a, b in zip(delta, previous)] + delta[shared:]
+
+class TelemetryPublisher:
+    def __init__(self, address=("127.0.0.1", DEFAULT_PORT), keyframe_interval=KEYFRAME_INTERVAL):
+        self.address = address
+        self.keyframe_interval = keyframe_interval
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.sequence = 0
+        self.previous = None # Positions sent in the previous frame (None = next frame is a keyframe)
+        self.state = None # (score, ammo, hp, reloading, game over) of the previous frame
+        # Statistics
+        self.sent = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+        self.encode_us = 0.0 # Time to build the last frame
+
+    def _events(self, game):
+        beaver = game.beaver
+        state = (game.score, beaver.current_ammo, beaver.hp, beaver.reloading, game.game_over)
+        previous, self.state = self.state, state
+        if previous is None:
+            return 0
+        score, ammo, hp, reloading, game_over = previous
+        events = 0
+        if beaver.current_ammo < ammo:
+            events |= EVENT_SHOT
+        if beaver.reloading and not reloading:
+            events |= EVENT_RELOAD
+        if beaver.hp < hp:
+            events |= EVENT_BEAVER_HIT
+        if game.score > score:
+            events |= EVENT_KILL
+        elif game.score < score:
+            events |= EVENT_ESCAPE
+        if game.game_over and not game_over:
+            events |= EVENT_GAME_OVER
+        elif game_over and not game.game_over:
+            events |= EVENT_RESTART
+        return events
+
+    def encode(self, game):
+        # Build the next frame (bytes) and remember its positions for the next delta
+        positions = _positions(game)
+        keyframe = self.previous is None or self.sequence % self.keyframe_interval == 0
+        if keyframe:
+            body = positions
+        else:
+            body = [_delta(current, previous) for current, previous in zip(positions, self.previous)]
+        values = array("h", body[0] + body[1] + body[2] + body[3])
+        if sys.byteorder == "big":
+            values.byteswap()
+        beaver = game.beaver
+        header = HEADER.pack(b"BT", VERSION, KEYFRAME if keyframe else 0, self.sequence,
+                             game.clock.get_ticks() & 0xFFFFFFFF, int(game.score), self._events(game),
+                             int(beaver.y), int(beaver.angle), beaver.hp, beaver.current_ammo,
+                             beaver.max_ammo, beaver.reloading, len(positions[0]), len(positions[2]))
+        self.previous = positions
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        return header + zlib.compress(values.tobytes(), 1)
+
+    def publish(self, game):
+        # Called at the end of GameManager.update; never blocks
+        start = time.perf_counter()
+        try:
+            frame = self.encode(game)
+            self.encode_us = (time.perf_counter() - start) * 1e6
+            self.socket.sendto(frame, self.address)
+        except Exception: # Buffer full, nobody listening, a value that doesn't fit the frame... never stop the game
+            self.dropped += 1
+            self.previous = None # The listener can't apply the next delta, send a keyframe
+            return False
+        self.sent += 1
+        self.bytes_sent += len(frame)
+        return True
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "bytes_per_frame": self.bytes_sent / self.sent if self.sent else 0,
+            "encode_us": self.encode_us,
+        }
+
+    def close(self):
+        self.socket.close()
+
+class TelemetryDecoder:
+    # Rebuilds full frames from the stream; returns None for frames it can't decode yet
+    def __init__(self):
+        self.positions = None # Positions of the last decoded frame
+        self.sequence = None
+        self.missed = 0 # Frames lost in transit (sequence gaps)
+
+    def feed(self, data):
+        (magic, version, flags, sequence, ticks, score, events, beaver_y, angle, hp, ammo, max_ammo,
+         reloading, bullets, enemies) = HEADER.unpack_from(data)
+        if magic != b"BT" or version != VERSION:
+            return None
+        if self.sequence is not None and sequence != (self.sequence + 1) & 0xFFFFFFFF:
+            self.missed += (sequence - self.sequence - 1) & 0xFFFFFFFF
+            self.positions = None # Can't apply deltas until the next keyframe
+        self.sequence = sequence
+        values = array("h")
+        values.frombytes(zlib.decompress(data[HEADER.size:]))
+        if sys.byteorder == "big":
+            values.byteswap()
+        values = values.tolist()
+        counts = (bullets, bullets, enemies, enemies)
+        body = []
+        offset = 0
+        for count in counts:
+            body.append(values[offset:offset + count])
+            offset += count
+        if flags & KEYFRAME:
+            positions = body
+        elif self.positions is not None:
+            positions = [_undelta(delta, previous) for delta, previous in zip(body, self.positions)]
+        else:
+            return None
+        self.positions = positions
+        return {
+            "sequence": sequence,
+            "ticks": ticks,
+            "score": score,
+            "events": [name for bit, name in EVENT_NAMES.items() if events & bit],
+            "beaver": {"y": beaver_y, "angle": angle, "hp": hp, "ammo": ammo, "max_ammo": max_ammo,
+                       "reloading": bool(reloading)},
+            "bullets": list(zip(positions[0], positions[1])),
+            "enemies": list(zip(positions[2], positions[3])),
+        }
+
+def _draw(screen, font, frame, stats):
+    # Minimal viewer: beaver and otters as boxes, bullets as dots
+    import pygame
+    import constants
+    screen.fill(constants.WHITE)
+    pygame.draw.rect(screen, constants.BLACK, (100, frame["beaver"]["y"], 80, 80), 2)
+    for x, y in frame["enemies"]:
+        pygame.draw.rect(screen, constants.RED, (x, y, 100, 80), 2)
+    for x, y in frame["bullets"]:
+        pygame.draw.circle(screen, constants.BLACK, (x, y), 5)
+    beaver = frame["beaver"]
+    text = (f"score {frame['score']}  hp {beaver['hp']}  ammo {beaver['ammo']}/{beaver['max_ammo']}  "
+            f"enemies {len(frame['enemies'])}  bullets {len(frame['bullets'])}  {stats}")
+    screen.blit(font.render(text, True, constants.BLACK), (10, 10))
+    pygame.display.flip()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Listen to the game's telemetry stream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--record", help="write every decoded frame to this JSON lines file")
+    parser.add_argument("--show", action="store_true", help="draw the live state in a window")
+    args = parser.parse_args(argv)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind((args.host, args.port))
+    listener.settimeout(0.1)
+    decoder = TelemetryDecoder()
+    record = open(args.record, "w") if args.record else None
+    screen = font = None
+    if args.show:
+        import pygame
+        import constants
+        pygame.init()
+        screen = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
+        pygame.display.set_caption("Beaver Shooter telemetry")
+        font = pygame.font.SysFont("arial", 16)
+    print(f"listening on {args.host}:{args.port}")
+    frames = 0
+    received = 0
+    window_start = time.perf_counter()
+    summary = ""
+    try:
+        while True:
+            if screen is not None:
+                import pygame
+                if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                    break
+            try:
+                data = listener.recv(65536)
+            except socket.timeout:
+                continue
+            received += len(data)
+            frame = decoder.feed(data)
+            if frame is None:
+                continue
+            frames += 1
+            if record is not None:
+                record.write(json.dumps(frame, separators=(",", ":")) + "\n")
+            if screen is not None:
+                _draw(screen, font, frame, summary)
+            now = time.perf_counter()
+            if now - window_start >= 1.0:
+                summary = (f"{frames / (now - window_start):.0f} frames/s, {received / max(frames, 1):.0f} B/frame, "
+                           f"{decoder.missed} missed")
+                print(summary, file=sys.stderr)
+                frames = received = 0
+                window_start = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if record is not None:
+            record.close()
+
+if __name__ == "__main__":
+    main()
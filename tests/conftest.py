@@ -0,0 +1,22 @@
+import pytest
+
+import benchmarks # noqa: F401 (dummy SDL drivers, game modules importable; shared with the benchmarks)
+import pygame
+import constants
+from input_source import InputFrame, HeldKeys
+from simulation import aim_policy
+
+def _restarting_aim_policy(game):
+    # The aim bot, restarting with R after a game over (while holding a key, like a player would)
+    if game.game_over:
+        return InputFrame(keydowns=(pygame.K_r,), held=HeldKeys((pygame.K_UP,)))
+    return aim_policy(game)
+
+@pytest.fixture
+def restarting_policy():
+    return _restarting_aim_policy
+
+@pytest.fixture
+def swarm(monkeypatch):
+    # An otter every 10 frames: the aim bot loses (and restarts) within a few thousand frames
+    monkeypatch.setattr(constants, "SPAWN_INTERVAL", 10)
@@ -0,0 +1,44 @@
+import pytest
+
+import pygame
+import assets
+from benchmarks.backends import build_scene
+
+# The "numpy" entity backend must play out exactly like the default "objects" one
+
+pytest.importorskip("numpy")
+
+FRAMES = 60
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets.preload()
+
+def snapshot(game):
+    # Score and every bullet and enemy position, for either entity backend
+    bullets = game.bullets
+    enemies = game.enemies
+    if game.backend == "numpy":
+        bullet_state = list(zip(bullets.x.tolist(), bullets.y.tolist(), bullets.rect_x.tolist(), bullets.rect_y.tolist()))
+        enemy_state = list(zip(enemies.x.tolist(), enemies.y.tolist(), enemies.speed.tolist()))
+    else:
+        bullet_state = [(bullet.x, bullet.y, bullet.rect.x, bullet.rect.y) for bullet in bullets]
+        enemy_state = [(enemy.x, enemy.y, enemy.speed) for enemy in enemies]
+    return game.score, bullet_state, enemy_state
+
+def play(backend, count, seed):
+    game = build_scene(backend, count, seed)
+    frames = []
+    for _ in range(FRAMES):
+        game.update()
+        frames.append(snapshot(game))
+    return frames
+
+@pytest.mark.parametrize("count", [20, 300])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_scene_plays_like_objects_backend(count, seed):
+    # With 300 otters most of them overlap: the merge pass pushes hundreds every frame
+    # and the bullets hit several at once
+    assert play("numpy", count, seed) == play("objects", count, seed)
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from entity_arrays import np
+from replay import Recorder, RecordingInput, Replay, Replayer, capture_state
+from simulation import HeadlessSimulation
+
+FRAMES = 3000
+SEEK_FRAME = 2500 # After the first restart
+
+def record(path, backend, policy):
+    # Records FRAMES frames of the aim bot into path; returns the state at SEEK_FRAME and at the end
+    sim = HeadlessSimulation(7, policy, backend)
+    recorder = Recorder(path, sim.seed, snapshot_interval=300)
+    sim.game.input_source = RecordingInput(sim.game.input_source, recorder)
+    for frame in range(FRAMES):
+        if frame == SEEK_FRAME:
+            middle = capture_state(sim.game)
+        sim.step()
+        recorder.end_frame()
+    recorder.close()
+    return middle, capture_state(sim.game)
+
+@pytest.mark.parametrize("recorded, replayed", [
+    ("objects", "objects"),
+    pytest.param("objects", "numpy", marks=pytest.mark.skipif(np is None, reason="needs NumPy")),
+])
+def test_replay_round_trip(swarm, restarting_policy, tmp_path, recorded, replayed):
+    path = str(tmp_path / "game.bvr")
+    middle, final = record(path, recorded, restarting_policy)
+    replay = Replay.load(path)
+    assert len(replay.frames) == FRAMES
+    replayer = Replayer(replay, replayed)
+    asyncio.run(replayer.play(verify=True))
+    assert replayer.mismatches == []
+    assert capture_state(replayer.game) == final
+    # Seeking restores the nearest snapshot and fast-forwards, in both directions
+    replayer.seek(SEEK_FRAME)
+    assert capture_state(replayer.game) == middle
+    replayer.seek(FRAMES)
+    assert capture_state(replayer.game) == final
@@ -0,0 +1,59 @@
+import pytest
+
+import constants
+from simulation import HeadlessSimulation
+from telemetry import TelemetryDecoder, TelemetryPublisher, _positions
+
+@pytest.fixture
+def publisher():
+    publisher = TelemetryPublisher(keyframe_interval=30)
+    yield publisher
+    publisher.close()
+
+def expected(game):
+    bullet_x, bullet_y, enemy_x, enemy_y = _positions(game)
+    return list(zip(bullet_x, bullet_y)), list(zip(enemy_x, enemy_y))
+
+def test_decoder_rebuilds_every_frame(swarm, restarting_policy, publisher):
+    sim = HeadlessSimulation(5, restarting_policy)
+    decoder = TelemetryDecoder()
+    events = set()
+    for _ in range(3000):
+        sim.step()
+        frame = decoder.feed(publisher.encode(sim.game))
+        bullets, enemies = expected(sim.game)
+        assert frame["bullets"] == bullets
+        assert frame["enemies"] == enemies
+        assert frame["score"] == sim.game.score
+        assert frame["beaver"]["hp"] == sim.game.beaver.hp
+        assert frame["beaver"]["ammo"] == sim.game.beaver.current_ammo
+        events.update(frame["events"])
+    assert {"shot", "kill", "escape", "game_over", "restart"} <= events
+    assert decoder.missed == 0
+
+def test_decoder_waits_for_keyframe_after_lost_frame(restarting_policy, publisher):
+    sim = HeadlessSimulation(5, restarting_policy)
+    decoder = TelemetryDecoder()
+    for sequence in range(90):
+        sim.step()
+        data = publisher.encode(sim.game)
+        if sequence == 40:
+            continue # Lost in transit
+        frame = decoder.feed(data)
+        if 40 < sequence < 60:
+            assert frame is None # Deltas can't be applied until the next keyframe
+        else:
+            assert frame["sequence"] == sequence
+            assert (frame["bullets"], frame["enemies"]) == expected(sim.game)
+    assert decoder.missed == 1
+
+def test_publish_never_raises(monkeypatch, publisher):
+    # Batch runs sweep MAX_AMMO past 255, and a value that doesn't fit the header drops the frame
+    monkeypatch.setattr(constants, "MAX_AMMO", 300)
+    sim = HeadlessSimulation(5)
+    sim.step()
+    frame = TelemetryDecoder().feed(publisher.encode(sim.game))
+    assert frame["beaver"]["max_ammo"] == 300
+    sim.game.beaver.hp = 2 ** 40
+    assert not publisher.publish(sim.game)
+    assert publisher.dropped == 1
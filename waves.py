@@ -0,0 +1,107 @@
+import json
+
+# Data-driven enemy waves (endless/horde mode), used instead of the fixed spawn interval
+# when constants.WAVE_CONFIG names a config file (see levels/horde.json):
+#
+#   {
+#     "max_enemies": 250,        # concurrent enemy cap, spawns wait while it is reached
+#     "spawns_per_frame": 6,     # bursts are spread over frames, so no frame spawns hundreds
+#     "loop": true,              # after the last wave start again from the first (false: repeat the last)...
+#     "loop_speed_bonus": 1,     # ...with every enemy this much faster per loop
+#     "waves": [
+#       {"name": "Horde", "duration": 1800, "interval": 300, "burst": 150,
+#        "speed": {"choices": [2, 3, 5], "weights": [5, 3, 1]}},
+#       ...
+#     ]
+#   }
+#
+# duration and interval are in frames: every interval frames of the wave, burst enemies are
+# queued. "speed" is {"min": a, "max": b} (uniform) or {"choices": [...], "weights": [...]}.
+# Speeds are whole pixels per frame (enemy positions are ints), so they must be integers.
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+class Wave:
+    def __init__(self, name, duration, interval, burst=1, speed=None):
+        if duration < 1 or interval < 1 or burst < 0:
+            raise ValueError(f"Wave {name!r}: duration and interval must be at least 1, burst at least 0")
+        self.name = name
+        self.duration = duration # Frames
+        self.interval = interval # Frames between bursts
+        self.burst = burst # Enemies queued per burst
+        speed = speed if speed is not None else {"min": 1, "max": 3}
+        if "choices" in speed:
+            self.choices = list(speed["choices"])
+            self.weights = speed.get("weights")
+            if not self.choices or (self.weights is not None and len(self.weights) != len(self.choices)):
+                raise ValueError(f"Wave {name!r}: speed needs choices (and one weight per choice)")
+            if not all(_is_int(choice) for choice in self.choices):
+                raise ValueError(f"Wave {name!r}: speed choices must be integers")
+        elif "min" in speed and "max" in speed:
+            self.choices = None
+            self.speed_min = speed["min"]
+            self.speed_max = speed["max"]
+            if not (_is_int(self.speed_min) and _is_int(self.speed_max)):
+                raise ValueError(f"Wave {name!r}: speed min and max must be integers")
+        else:
+            raise ValueError(f"Wave {name!r}: speed must have min/max or choices")
+
+    def pick_speed(self, rng):
+        if self.choices is None:
+            return rng.randint(self.speed_min, self.speed_max)
+        return rng.choices(self.choices, self.weights)[0]
+
+class WaveScheduler:
+    def __init__(self, waves, max_enemies=250, spawns_per_frame=6, loop=True, loop_speed_bonus=1):
+        if not waves:
+            raise ValueError("A wave config needs at least one wave")
+        if not _is_int(loop_speed_bonus):
+            raise ValueError("loop_speed_bonus must be an integer")
+        self.waves = waves
+        self.max_enemies = max_enemies
+        self.spawns_per_frame = spawns_per_frame
+        self.loop = loop
+        self.loop_speed_bonus = loop_speed_bonus
+        self.reset()
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        waves = [Wave(wave.get("name", f"Wave {index + 1}"), wave["duration"], wave["interval"],
+                      wave.get("burst", 1), wave.get("speed"))
+                 for index, wave in enumerate(config["waves"])]
+        return cls(waves, config.get("max_enemies", 250), config.get("spawns_per_frame", 6),
+                   config.get("loop", True), config.get("loop_speed_bonus", 1))
+
+    def reset(self):
+        self.index = 0 # Current wave
+        self.frame = 0 # Frames into the current wave
+        self.loops = 0 # Times all waves have been played
+        self.pending = 0 # Queued enemies not spawned yet
+
+    @property
+    def wave(self):
+        return self.waves[self.index]
+
+    def update(self, alive, rng):
+        # Advance one frame; returns the speeds of the enemies to spawn this frame.
+        # alive: number of enemies currently in play (for the concurrent cap)
+        wave = self.wave
+        if self.frame % wave.interval == 0:
+            # Never queue more than could ever be on screen at once
+            self.pending = min(self.pending + wave.burst, self.max_enemies)
+        count = min(self.pending, self.spawns_per_frame, self.max_enemies - alive)
+        bonus = self.loops * self.loop_speed_bonus
+        speeds = [wave.pick_speed(rng) + bonus for _ in range(max(0, count))]
+        self.pending -= len(speeds)
+        self.frame += 1
+        if self.frame >= wave.duration:
+            self.frame = 0
+            if self.index + 1 < len(self.waves):
+                self.index += 1
+            elif self.loop:
+                self.index = 0
+                self.loops += 1
+        return speeds